@@ -7,10 +7,17 @@ New in this revision
 • Support for parameterized instructions (LD reg, operand)
 • 3-byte instruction format for multi-register operations
 • Scalable register system
+• .text / .data sections with DB and DS directives; the .data section is
+  emitted as a RAM-init image (<name>.ram.bin) preloaded at reset
+• Separate compilation: `assemble -c` writes a relocatable object file
+  (.obj) with its symbol and relocation tables; .global exports a symbol,
+  .extern imports one from another module, and linker.py links objects
+  into a ROM image
 
 Usage
 ─────
 $ python assembly.py assemble prog.asm -o rom.bin
+$ python assembly.py assemble -c lib.asm -o lib.obj
 """
 from __future__ import annotations
 
@@ -70,6 +77,12 @@ HEX_BYTE  = re.compile(r"^\$([0-9A-Fa-f]{1,2})$")
 HEX_IMM   = re.compile(r"^#\$([0-9A-Fa-f]{1,2})$")
 LABEL_RE  = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 EQU_RE    = re.compile(r"^(\w+)\s+EQU\s+\$([0-9A-Fa-f]{1,2})$")
+SECTION_RE = re.compile(r"^\.(text|data)$", re.IGNORECASE)
+LINKAGE_RE = re.compile(r"^\.(global|extern)\s+(.+)$", re.IGNORECASE)
+
+# data directives (DB $01, $02 / DS $10) and the RAM window the .data section lives in
+DATA_DIRECTIVES = {"DB", "DS"}
+RAM_BASE, RAM_END = 0x80, 0xE0
 
 class AsmError(RuntimeError):
     pass
@@ -96,14 +109,86 @@ def _parse_instruction(inst: str) -> Tuple[str, List[str]]:
     operands = [op.strip() for op in operand_str.split(',')]  # Split by comma and strip whitespace
     return mnem, operands
 
+def _data_size(mnem: str, ops: List[str], line: int) -> int:
+    """Bytes taken by a DB / DS directive (known in pass 1)."""
+    if not ops:
+        raise AsmError(f"Line {line}: {mnem} needs an operand")
+    if mnem.upper() == "DB":
+        return len(ops)
+    if len(ops) != 1 or not (m := HEX_BYTE.match(ops[0])):
+        raise AsmError(f"Line {line}: DS takes a single byte count, e.g. DS $10")
+    return int(m.group(1), 16)
+
+def _data_bytes(mnem: str, ops: List[str], labels: Dict[str, int], line: int) -> List[int]:
+    if mnem.upper() == "DS":
+        return [0x00] * _data_size(mnem, ops, line)
+    values = []
+    for token in ops:
+        if (m := HEX_BYTE.match(token)):
+            values.append(int(m.group(1), 16))
+        elif token in labels:
+            values.append(labels[token] & 0xFF)
+        else:
+            raise AsmError(f"Line {line}: malformed data byte '{token}'")
+    return values
+
 # 3.  Two-pass assembler
+@dataclass
+class Program:
+    rom: bytes
+    symbols: Dict[str, int]     # labels and EQU constants
+    ram: bytes = b""            # .data section, loaded at $80 on reset
+
+@dataclass
+class Relocation:
+    section: str                # "text" or "data": where the byte to patch lives
+    offset: int                 # byte offset within that section
+    kind: str                   # "ABS" address byte, "REL" branch offset
+    symbol: str
+
+@dataclass
+class ObjectFile:
+    """One separately assembled module: text at 0 and data at $80, until linked."""
+    name: str
+    text: bytes
+    data: bytes
+    symbols: Dict[str, Tuple[str, int]]     # name -> (section "text"/"data"/"abs", offset)
+    globals: List[str]
+    externs: List[str]
+    relocs: List[Relocation]
+
 def assemble(lines: List[str]) -> bytes:
     # Convert source lines to a ROM image (byte string).
+    return assemble_program(lines).rom
+
+def assemble_program(lines: List[str]) -> Program:
+    """Assemble `lines`, keeping the symbol table alongside the ROM image."""
+    return _assemble(lines)[0]
+
+def assemble_object(lines: List[str], name: str) -> ObjectFile:
+    """Assemble one module of a multi-module program into a relocatable object."""
+    prog, sections, linkage, relocs = _assemble(lines, relocatable=True)
+    symbols = {sym: (sec, prog.symbols[sym] - (RAM_BASE if sec == "data" else 0))
+               for sym, sec in sections.items() if sec != "extern"}
+    for sym in linkage["global"]:
+        if sym not in symbols:
+            raise AsmError(f"{name}: .global symbol '{sym}' is never defined")
+    return ObjectFile(name, prog.rom, prog.ram, symbols, linkage["global"], linkage["extern"], relocs)
+
+def _assemble(lines: List[str], relocatable: bool = False):
+    """Both passes. Returns (program, symbol sections, .global/.extern names, relocations).
+
+    Relocatable code is assembled as if text started at 0 and data at $80; every
+    byte that depends on where the linker puts a text/data/extern symbol is
+    listed as a Relocation. Branches to labels of the same module need none.
+    """
     src = [ln.split('//', 1)[0].rstrip() for ln in lines]  # strip comments
 
-    # pass-1: collect labels / constants, compute PC
+    # pass-1: collect labels / constants, compute PC (and the .data location counter)
     labels: Dict[str, int] = {}
-    pc = 0
+    sections: Dict[str, str] = {}                    # symbol -> text / data / abs / extern
+    linkage: Dict[str, List[str]] = {"global": [], "extern": []}
+    pc, dpc, section = 0, RAM_BASE, "text"
     for line_no, ln in enumerate(src, 1):
         lab, inst = _split_label(ln)
 
@@ -113,31 +198,86 @@ def assemble(lines: List[str]) -> bytes:
             if sym in labels:
                 raise AsmError(f"Line {line_no}: duplicate symbol '{sym}'")
             labels[sym] = val & 0xFF
+            sections[sym] = "abs"
+            continue
+
+        # .global / .extern: only meaningful to the linker
+        if inst and (m := LINKAGE_RE.match(inst)):
+            kind = m.group(1).lower()
+            names = [n.strip() for n in m.group(2).split(",")]
+            if not all(LABEL_RE.match(n) for n in names):
+                raise AsmError(f"Line {line_no}: malformed .{kind} list '{m.group(2)}'")
+            if kind == "extern":
+                if not relocatable:
+                    raise AsmError(f"Line {line_no}: .extern needs separate compilation (assemble -c, linker.py)")
+                for sym in names:
+                    if sym in labels:
+                        raise AsmError(f"Line {line_no}: duplicate symbol '{sym}'")
+                    labels[sym], sections[sym] = 0, "extern"
+            linkage[kind].extend(names)
             continue
 
         if lab:
             if lab in labels:
                 raise AsmError(f"Line {line_no}: duplicate label '{lab}'")
-            labels[lab] = pc
+            labels[lab] = dpc if section == "data" else pc
+            sections[lab] = section
 
         if not inst:
             continue  # blank line or label-only
 
+        if (m := SECTION_RE.match(inst)):
+            section = m.group(1).lower()
+            continue
+
         mnem, ops = _parse_instruction(inst)
-        mode, _ = _determine_mode(mnem, ops, labels, line_no)
+        if mnem.upper() in DATA_DIRECTIVES:
+            size = _data_size(mnem, ops, line_no)
+            if section == "data":
+                dpc += size
+                if dpc > RAM_END:
+                    raise AsmError(f"Line {line_no}: .data section overflows RAM ($80-$DF)")
+            else:
+                pc += size
+            continue
+        if section == "data":
+            raise AsmError(f"Line {line_no}: instruction '{mnem}' in .data section")
+
+        mode, _ = _determine_mode(mnem, ops, None, line_no)     # labels may still be ahead (.data)
         pc += _lookup(mnem, mode, line=line_no).size
 
     # pass-2: emit op-codes + operands
     rom: List[int] = []
-    pc = 0
+    ram: List[int] = []
+    relocs: List[Relocation] = []
+    pc, section = 0, "text"
+
+    def relocate(token: str, sec: str, offset: int, kind: str = "ABS"):
+        if relocatable and sections.get(token) in ("text", "data", "extern"):
+            relocs.append(Relocation(sec, offset, kind, token))
 
     for line_no, ln in enumerate(src, 1):
         lab, inst = _split_label(ln)
 
-        if not inst or EQU_RE.match(inst):
+        if not inst or EQU_RE.match(inst) or LINKAGE_RE.match(inst):
+            continue
+
+        if (m := SECTION_RE.match(inst)):
+            section = m.group(1).lower()
             continue
 
         mnem, ops = _parse_instruction(inst)
+        if mnem.upper() in DATA_DIRECTIVES:
+            data = _data_bytes(mnem, ops, labels, line_no)
+            out = ram if section == "data" else rom
+            if mnem.upper() == "DB":
+                for i, token in enumerate(ops):
+                    relocate(token, section, len(out) + i)
+            out.extend(data)
+            if section != "data":
+                pc = len(rom)
+            continue
+
         mode, op_val = _determine_mode(mnem, ops, labels, line_no)
         opc = _lookup(mnem, mode, line=line_no)
         rom.append(opc.code)
@@ -158,11 +298,15 @@ def assemble(lines: List[str]) -> bytes:
 
         elif mode == "DIR":        # Register + direct address (LD A, $80)
             reg_num, addr_val = op_val
+            relocate(ops[-1], "text", len(rom) + 1)
             rom.extend([reg_num, addr_val])
 
         elif mode == "REL":        # Relative branch (BRA loop)
             if op_val == "*":
                 off = (-1 & 0xFF)
+            elif sections.get(op_val) == "extern":
+                relocate(op_val, "text", len(rom), "REL")
+                off = 0x00
             else:
                 target_addr = labels[op_val]
                 # PC during branch calculation will be the address after the full 3-byte instruction
@@ -179,13 +323,23 @@ def assemble(lines: List[str]) -> bytes:
             rom.append(0x00)
             
         pc = len(rom)
-    return bytes(rom)
+    return Program(bytes(rom), labels, bytes(ram)), sections, linkage, relocs
 
 # 4.  Operand classification
-def _determine_mode(mnem: str, ops: List[str], labels: Dict[str, int], line: int):
+def _symbol_value(token: str, labels: Dict[str, int] | None, line: int) -> int:
+    """Value of a label operand; 0 in pass 1 (labels=None), where only the mode matters."""
+    if labels is None:
+        return 0
+    if token not in labels:
+        raise AsmError(f"Line {line}: unknown symbol '{token}'")
+    return labels[token]
+
+def _determine_mode(mnem: str, ops: List[str], labels: Dict[str, int] | None, line: int):
     """
     Return (addressing_mode, operand_value_or_symbol).
     For IMM/DIR the value is an int; for REL it is the symbol (or "*").
+    A label operand is DIR whatever it resolves to, so pass 1 classifies
+    operands with labels=None, before forward (e.g. .data) labels are known.
     """
     mnem_u = mnem.upper()
 
@@ -209,9 +363,7 @@ def _determine_mode(mnem: str, ops: List[str], labels: Dict[str, int], line: int
         if LABEL_RE.match(token):
             if mnem_u in BRANCHES:
                 return "REL", token
-            if token not in labels:
-                raise AsmError(f"Line {line}: unknown symbol '{token}'")
-            return "DIR", labels[token]
+            return "DIR", _symbol_value(token, labels, line)
 
         raise AsmError(f"Line {line}: malformed operand '{token}'")
 
@@ -253,9 +405,7 @@ def _determine_mode(mnem: str, ops: List[str], labels: Dict[str, int], line: int
         
         elif LABEL_RE.match(val_token):
             # Symbol/label for direct addressing
-            if val_token not in labels:
-                raise AsmError(f"Line {line}: unknown symbol '{val_token}'")
-            addr_val = labels[val_token]
+            addr_val = _symbol_value(val_token, labels, line)
             if mnem_u in {"LD", "ST"}:
                 return "DIR", (reg_num, addr_val)
             else:
@@ -274,7 +424,78 @@ def _lookup(mnem: str, mode: str, *, line: int) -> Opcode:
         raise AsmError(f"Line {line}: {mnem} does not support {mode} addressing")
     return OPCODES[key]
 
-# 6.  CLI
+# 6.  Output files: ROM image, RAM-init image and symbol table side by side
+def ram_image_path(rom_path: str | pathlib.Path) -> pathlib.Path:
+    return pathlib.Path(rom_path).with_suffix(".ram.bin")
+
+def write_program(rom_path: str | pathlib.Path, prog: Program):
+    """Write the ROM image plus its .sym table and (if any .data) .ram.bin image."""
+    rom_path = pathlib.Path(rom_path)
+    rom_path.write_bytes(prog.rom)
+    write_symbols(rom_path.with_suffix(".sym"), prog.symbols)
+    ram_path = ram_image_path(rom_path)
+    if prog.ram:
+        ram_path.write_bytes(prog.ram)
+    elif ram_path.exists():
+        ram_path.unlink()                   # stale image from an earlier build
+
+# symbol files: "NAME $XX" per line
+def write_symbols(path: str | pathlib.Path, symbols: Dict[str, int]):
+    text = "".join(f"{name} ${addr:02X}\n" for name, addr in sorted(symbols.items(), key=lambda kv: kv[1]))
+    pathlib.Path(path).write_text(text, encoding="utf-8")
+
+def read_symbols(path: str | pathlib.Path) -> Dict[str, int]:
+    symbols: Dict[str, int] = {}
+    for ln in pathlib.Path(path).read_text(encoding="utf-8").splitlines():
+        if ln.strip():
+            name, addr = ln.split()
+            symbols[name] = int(addr.lstrip("$"), 16)
+    return symbols
+
+# object files: text, one record per line
+#   # object NAME          header
+#   T <hex> / D <hex>      text and data bytes
+#   S NAME SECTION $XX [global]
+#   X NAME                 extern
+#   R SECTION $XX KIND SYMBOL
+def format_object(obj: ObjectFile) -> str:
+    lines = [f"# object {obj.name}", f"T {obj.text.hex()}", f"D {obj.data.hex()}"]
+    for name, (sec, off) in obj.symbols.items():
+        lines.append(f"S {name} {sec} ${off:02X}" + (" global" if name in obj.globals else ""))
+    lines += [f"X {name}" for name in obj.externs]
+    lines += [f"R {r.section} ${r.offset:02X} {r.kind} {r.symbol}" for r in obj.relocs]
+    return "\n".join(lines) + "\n"
+
+def parse_object(text: str) -> ObjectFile:
+    lines = text.splitlines()
+    if not lines or not lines[0].startswith("# object "):
+        raise AsmError("not an object file")
+    obj = ObjectFile(lines[0][len("# object "):], b"", b"", {}, [], [], [])
+    for ln in lines[1:]:
+        tag, *fields = ln.split()
+        if tag == "T":
+            obj.text = bytes.fromhex(fields[0] if fields else "")
+        elif tag == "D":
+            obj.data = bytes.fromhex(fields[0] if fields else "")
+        elif tag == "S":
+            obj.symbols[fields[0]] = (fields[1], int(fields[2].lstrip("$"), 16))
+            if fields[3:] == ["global"]:
+                obj.globals.append(fields[0])
+        elif tag == "X":
+            obj.externs.append(fields[0])
+        elif tag == "R":
+            obj.relocs.append(Relocation(fields[0], int(fields[1].lstrip("$"), 16), fields[2], fields[3]))
+        else:
+            raise AsmError(f"{obj.name}: unknown object record '{tag}'")
+    return obj
+
+def write_object(path: str | pathlib.Path, obj: ObjectFile):
+    pathlib.Path(path).write_text(format_object(obj), encoding="utf-8")
+
+def read_object(path: str | pathlib.Path) -> ObjectFile:
+    return parse_object(pathlib.Path(path).read_text(encoding="utf-8"))
+
+# 7.  CLI
 @click.group()
 def cli():
     """8-bit CPU utility suite – assembler only."""
@@ -282,13 +503,15 @@ def cli():
 @cli.command("assemble")
 @click.argument("asm_path", type=click.Path(dir_okay=False, exists=True))
 @click.option("--out", "-o", default=None, show_default=True,
-              help="Output ROM binary (defaults to build/<asm_name>.bin)")
-def assemble_cmd(asm_path: str, out: str):
+              help="Output ROM binary (defaults to build/<asm_name>.bin, or .obj with -c)")
+@click.option("--object", "-c", "as_object", is_flag=True,
+              help="Write a relocatable object file for linker.py instead of a ROM image")
+def assemble_cmd(asm_path: str, out: str, as_object: bool):
     """Assemble ASM_PATH into a raw ROM image."""
     # Auto-generate output path if not specified
     if out is None:
         asm_file = pathlib.Path(asm_path)
-        out = f"Programs/build/{asm_file.stem}.bin"
+        out = f"Programs/build/{asm_file.stem}.{'obj' if as_object else 'bin'}"
     
     # Ensure Programs/build directory exists
     build_dir = pathlib.Path("Programs/build")
@@ -296,12 +519,21 @@ def assemble_cmd(asm_path: str, out: str):
     
     lines = pathlib.Path(asm_path).read_text(encoding="utf-8").splitlines()
     try:
-        rom = assemble(lines)
+        if as_object:
+            obj = assemble_object(lines, pathlib.Path(asm_path).stem)
+            write_object(out, obj)
+            click.echo(f"[assembler] wrote object ({len(obj.text)} text, {len(obj.data)} data bytes, "
+                       f"{len(obj.relocs)} relocations) -> {out}")
+            return
+        prog = assemble_program(lines)
     except AsmError as e:
         click.echo(f"Assembler error: {e}", err=True)
         sys.exit(1)
-    pathlib.Path(out).write_bytes(rom)
+    rom = prog.rom
+    write_program(out, prog)
     click.echo(f"[assembler] wrote {len(rom)} bytes -> {out}")   # plain ASCII arrow
+    if prog.ram:
+        click.echo(f"[assembler] wrote {len(prog.ram)} RAM-init bytes -> {ram_image_path(out)}")
 
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,129 @@
+"""
+backends.py
+Simulator back-ends for the 8-But MightyController testbench.
+
+Both back-ends build the same src/verilog sources and computer_TB.v, take
+the same plusargs and print the same console output; they differ only in
+how the testbench image is produced and started:
+• icarus     iverilog -g2012 → tb_new.out, interpreted by vvp (default)
+• verilator  verilator --binary → a compiled executable, much faster for
+             long cycle budgets (no waves.vcd; use icarus for GTKWave)
+
+Compile-time variants of the RTL (e.g. PREFETCH) are selected with `define
+macros; each set of defines gets its own image, so variants never overwrite
+each other or share cached results. An image is rebuilt only when it is
+missing or older than one of the sources.
+
+Usage
+─────
+$ python MightyController.py run test2(ALU) --backend verilator
+$ python MightyController.py bench test2(ALU) --cycles 200000
+"""
+from __future__ import annotations
+
+import os, pathlib, shutil
+from typing import Dict, List, Sequence
+
+RTL_DIR = pathlib.Path("src/verilog")
+TB_DIR  = pathlib.Path("src/testbench")
+TB_TOP  = "computer_TB"
+
+def variant_name(defines: Sequence[str]) -> str:
+    """Image name suffix for a set of `define macros ("" for the default build)."""
+    return "_".join(sorted(d.lower() for d in defines))
+
+def define_flags(defines: Sequence[str]) -> List[str]:
+    return [f"-D{d}" for d in sorted(defines)]          # same syntax for iverilog and verilator
+
+class SimBackend:
+    """Compile + run commands for one simulator. Sub-classes fill in the tools."""
+    name = ""
+
+    @property
+    def image(self) -> pathlib.Path:
+        """Testbench image of the default build."""
+        return self.image_for()
+
+    def image_for(self, defines: Sequence[str] = ()) -> pathlib.Path:
+        raise NotImplementedError
+
+    def sources(self) -> List[str]:
+        verilog_files       = sorted(map(str, RTL_DIR.glob("*.v")))
+        systemverilog_files = sorted(map(str, RTL_DIR.glob("*.sv")))
+        return verilog_files + systemverilog_files + [str(TB_DIR / f"{TB_TOP}.v")]
+
+    def needs_build(self, defines: Sequence[str] = ()) -> bool:
+        """True when the image for `defines` is missing or older than any source file."""
+        image = self.image_for(defines)
+        if not image.exists():
+            return True
+        built = image.stat().st_mtime_ns
+        return any(os.stat(src).st_mtime_ns > built for src in self.sources())
+
+    def available(self) -> bool:
+        """True when the simulator's tools are on PATH."""
+        raise NotImplementedError
+
+    def compile_command(self, defines: Sequence[str] = ()) -> List[str]:
+        raise NotImplementedError
+
+    def run_command(self, sim_args: List[str]) -> List[str]:
+        """Full command line for `sim_args` (testbench image first, then plusargs)."""
+        raise NotImplementedError
+
+class IcarusBackend(SimBackend):
+    name  = "icarus"
+
+    def image_for(self, defines: Sequence[str] = ()) -> pathlib.Path:
+        return TB_DIR / f"tb_{variant_name(defines) or 'new'}.out"
+
+    def available(self) -> bool:
+        return shutil.which("iverilog") is not None and shutil.which("vvp") is not None
+
+    def compile_command(self, defines: Sequence[str] = ()) -> List[str]:
+        return (["iverilog", "-g2012", "-o", str(self.image_for(defines)), "-I", str(RTL_DIR)]
+                + define_flags(defines) + self.sources())
+
+    def run_command(self, sim_args: List[str]) -> List[str]:
+        return ["vvp"] + sim_args
+
+class VerilatorBackend(SimBackend):
+    name    = "verilator"
+    obj_dir = pathlib.Path("Programs/build/verilator")
+
+    def obj_dir_for(self, defines: Sequence[str] = ()) -> pathlib.Path:
+        variant = variant_name(defines)
+        return self.obj_dir.with_name(f"{self.obj_dir.name}_{variant}") if variant else self.obj_dir
+
+    def image_for(self, defines: Sequence[str] = ()) -> pathlib.Path:
+        return self.obj_dir_for(defines) / f"V{TB_TOP}"
+
+    @property
+    def executable(self) -> str:
+        # $VERILATOR overrides the tool name for non-standard installs
+        return os.environ.get("VERILATOR", "verilator")
+
+    def available(self) -> bool:
+        return shutil.which(self.executable) is not None
+
+    def compile_command(self, defines: Sequence[str] = ()) -> List[str]:
+        return [self.executable, "--binary", "--timing", "-j", "0",
+                "-Wno-fatal", "-Wno-lint", "-Wno-style",
+                "--top-module", TB_TOP, "-I" + str(RTL_DIR),
+                "--Mdir", str(self.obj_dir_for(defines)), "-o", f"V{TB_TOP}"] \
+               + define_flags(defines) + self.sources()
+
+    def run_command(self, sim_args: List[str]) -> List[str]:
+        return list(sim_args)             # the image is the executable
+
+BACKENDS: Dict[str, SimBackend] = {b.name: b for b in (IcarusBackend(), VerilatorBackend())}
+DEFAULT_BACKEND = "icarus"
+
+def get_backend(name: str = DEFAULT_BACKEND) -> SimBackend:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown simulator backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+def available_backends() -> List[str]:
+    return [name for name, b in BACKENDS.items() if b.available()]
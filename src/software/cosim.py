@@ -0,0 +1,332 @@
+"""
+cosim.py
+Python peripheral models on the 8-But MightyController I/O ports ($F0-$FF).
+
+The testbench talks to this module over two named pipes (+COSIM_TX /
++COSIM_RX). Port traffic is not synchronised per access: the testbench
+queues writes and reads as text lines and hands them over once every N
+cycles, together with a sync line; the models process the batch, advance
+to that cycle and answer with the 16 input-port bytes the CPU will read
+until the next sync. Larger batches mean fewer round trips (faster runs),
+at the cost of input values that are up to N cycles old.
+
+Channel protocol
+────────────────
+testbench → models   W <cycle> <port> <value>   port write   (hex port / value)
+                     R <cycle> <port>           port read
+                     S <cycle>                  end of batch, reply expected
+                     E <cycle>                  end of run, no reply
+models → testbench   16 hex bytes on one line   input-port values $F0..$FF
+
+Models
+──────
+• uart@F0[=text]           data port (+0) and status port (+1: bit0 RX ready,
+                           bit1 TX ready); TX bytes are printed line by line,
+                           RX bytes come from `text`
+• counter@F2[=divider]     free-running count of cycles / divider; a write loads it
+• file@F4=in.bin[,out.bin] byte stream: reads step through in.bin, writes append
+                           to out.bin; status port (+1) bit0 = input left
+
+Usage
+─────
+$ python cosim.py run "Programs/asm/echo.asm" --attach uart@F0=hello --attach counter@F2 --batch 64
+"""
+from __future__ import annotations
+
+import errno, os, pathlib, subprocess, sys, tempfile, threading, time
+from typing import Callable, Dict, List, Optional
+
+import click
+
+import simulator
+from backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from assembler import AsmError
+
+PORT_BASE, PORT_COUNT = 0xF0, 16
+DEFAULT_BATCH = 64
+
+class CosimError(RuntimeError):
+    pass
+
+# 1.  Peripheral models
+class Peripheral:
+    """A model occupying `width` consecutive ports from `base` (0..15, relative to $F0)."""
+    width = 1
+
+    def __init__(self, base: int):
+        self.base = base
+
+    def write(self, offset: int, value: int, cycle: int):
+        pass
+
+    def read(self, offset: int, cycle: int):
+        """The CPU read a port; models with read side effects (FIFOs) advance here."""
+
+    def value(self, offset: int) -> int:
+        """Byte presented on the port until the next sync."""
+        return 0x00
+
+    def tick(self, cycle: int):
+        """End of a batch: the simulation has reached `cycle`."""
+
+    def close(self):
+        pass
+
+class Uart(Peripheral):
+    width = 2
+
+    def __init__(self, base: int, rx: bytes = b"", sink: Callable[[str], None] = print):
+        super().__init__(base)
+        self.rx = bytearray(rx)
+        self.tx = bytearray()
+        self.sink = sink
+
+    def write(self, offset, value, cycle):
+        if offset != 0:
+            return
+        if value == 0x0A:
+            self.sink(f"[uart] {self.tx.decode('latin-1')}")
+            self.tx.clear()
+        else:
+            self.tx.append(value)
+
+    def read(self, offset, cycle):
+        if offset == 0 and self.rx:
+            self.rx.pop(0)
+
+    def value(self, offset):
+        if offset == 0:
+            return self.rx[0] if self.rx else 0x00
+        return (0x01 if self.rx else 0x00) | 0x02
+
+    def close(self):
+        if self.tx:
+            self.sink(f"[uart] {self.tx.decode('latin-1')}")
+
+class Counter(Peripheral):
+    def __init__(self, base: int, divider: int = 1):
+        super().__init__(base)
+        self.divider = max(1, divider)
+        self.origin = 0             # cycle at which the count was `loaded`
+        self.loaded = 0
+        self.cycle = 0
+
+    def write(self, offset, value, cycle):
+        self.origin, self.loaded = cycle, value
+
+    def tick(self, cycle):
+        self.cycle = cycle
+
+    def value(self, offset):
+        return (self.loaded + (self.cycle - self.origin) // self.divider) & 0xFF
+
+class FileStream(Peripheral):
+    width = 2
+
+    def __init__(self, base: int, source: Optional[str] = None, target: Optional[str] = None):
+        super().__init__(base)
+        self.data = pathlib.Path(source).read_bytes() if source else b""
+        self.pos = 0
+        self.out = open(target, "wb") if target else None
+
+    def write(self, offset, value, cycle):
+        if offset == 0 and self.out:
+            self.out.write(bytes([value]))
+
+    def read(self, offset, cycle):
+        if offset == 0 and self.pos < len(self.data):
+            self.pos += 1
+
+    def value(self, offset):
+        more = self.pos < len(self.data)
+        if offset == 0:
+            return self.data[self.pos] if more else 0x00
+        return 0x01 if more else 0x00
+
+    def close(self):
+        if self.out:
+            self.out.close()
+
+# 2.  Port bus
+class PortBus:
+    def __init__(self, peripherals: List[Peripheral]):
+        self.peripherals = peripherals
+        self.ports: Dict[int, Peripheral] = {}
+        for p in peripherals:
+            for port in range(p.base, p.base + p.width):
+                if port >= PORT_COUNT:
+                    raise CosimError(f"{type(p).__name__} at ${PORT_BASE + p.base:02X} runs past $FF")
+                if port in self.ports:
+                    raise CosimError(f"port ${PORT_BASE + port:02X} is claimed twice")
+                self.ports[port] = p
+        self.transactions = 0
+        self.syncs = 0
+
+    def handle(self, line: str) -> Optional[str]:
+        """Apply one channel line; returns the reply for a sync, else None."""
+        kind, *fields = line.split()
+        cycle = int(fields[0])
+        if kind == "W":
+            port, value = int(fields[1], 16), int(fields[2], 16)
+            if (p := self.ports.get(port)):
+                p.write(port - p.base, value, cycle)
+            self.transactions += 1
+        elif kind == "R":
+            port = int(fields[1], 16)
+            if (p := self.ports.get(port)):
+                p.read(port - p.base, cycle)
+            self.transactions += 1
+        elif kind == "S":
+            self.syncs += 1
+            for p in self.peripherals:
+                p.tick(cycle)
+            return " ".join(f"{v:02x}" for v in self.inputs()) + "\n"
+        elif kind == "E":
+            for p in self.peripherals:
+                p.tick(cycle)
+        else:
+            raise CosimError(f"unexpected channel line: {line!r}")
+        return None
+
+    def inputs(self) -> List[int]:
+        return [p.value(port - p.base) if (p := self.ports.get(port)) else 0x00
+                for port in range(PORT_COUNT)]
+
+    def close(self):
+        for p in self.peripherals:
+            p.close()
+
+def parse_attach(spec: str, sink: Callable[[str], None] = print) -> Peripheral:
+    """Build a model from `kind@PORT[=arg]`, e.g. uart@F0=hi, counter@$F2=16, file@F4=in.bin,out.bin."""
+    kind, sep, rest = spec.partition("@")
+    port_txt, _, arg = rest.partition("=")
+    try:
+        port = int(port_txt.strip().lstrip("$"), 16)
+    except ValueError:
+        raise CosimError(f"malformed peripheral '{spec}' (expected kind@F0[=arg])")
+    if not sep or not PORT_BASE <= port < PORT_BASE + PORT_COUNT:
+        raise CosimError(f"malformed peripheral '{spec}' (port must be $F0-$FF)")
+    base = port - PORT_BASE
+
+    kind = kind.strip().lower()
+    if kind == "uart":
+        return Uart(base, arg.encode("latin-1"), sink)
+    if kind == "counter":
+        return Counter(base, int(arg) if arg else 1)
+    if kind == "file":
+        source, _, target = arg.partition(",")
+        return FileStream(base, source or None, target or None)
+    raise CosimError(f"unknown peripheral '{kind}' (uart, counter or file)")
+
+# 3.  Channel
+def _open_writer(path: str, proc: subprocess.Popen) -> int:
+    """Open the FIFO the testbench reads from, waiting until it has opened its end."""
+    while True:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as e:
+            if e.errno != errno.ENXIO:
+                raise
+            if proc.poll() is not None:
+                raise CosimError("simulator exited before opening the co-simulation channel")
+            time.sleep(0.01)
+            continue
+        try:
+            os.set_blocking(fd, True)
+        except OSError:
+            os.close(fd)
+            raise
+        return fd
+
+def cosim_plusargs(tx: str, rx: str, batch: int) -> List[str]:
+    return [f"+COSIM_TX={tx}", f"+COSIM_RX={rx}", f"+COSIM_BATCH={batch}"]
+
+def run_cosim(sim_args: List[str], bus: PortBus, batch: int = DEFAULT_BATCH,
+              backend=None, on_line: Callable[[str], None] = print) -> int:
+    """Run the testbench with `sim_args` plus the bridge plusargs, serving `bus`."""
+    if not hasattr(os, "mkfifo"):
+        raise CosimError("co-simulation needs named pipes (Linux / macOS)")
+    backend = backend or get_backend()
+
+    with tempfile.TemporaryDirectory(prefix="cosim") as tmp:
+        tx, rx = os.path.join(tmp, "tx"), os.path.join(tmp, "rx")
+        os.mkfifo(tx)
+        os.mkfifo(rx)
+        cmd = backend.run_command(sim_args + cosim_plusargs(tx, rx, batch))
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    text=True, errors="ignore")
+        except FileNotFoundError:
+            raise CosimError(f"'{cmd[0]}' not found on PATH")
+
+        # Console output is drained on its own thread so the simulator never blocks on stdout
+        def pump():
+            for line in proc.stdout:
+                on_line(line.rstrip("\n"))
+        console = threading.Thread(target=pump, daemon=True)
+        console.start()
+
+        # The testbench opens TX (its writer) first, then RX; open ours in the same order
+        tx_fd, rx_fd = os.open(tx, os.O_RDONLY | os.O_NONBLOCK), -1
+        try:
+            try:
+                rx_fd = _open_writer(rx, proc)
+                os.set_blocking(tx_fd, True)
+            except BaseException:
+                # Close what is already open; the simulator would block forever on its end
+                for fd in (tx_fd, rx_fd):
+                    if fd >= 0:
+                        os.close(fd)
+                if proc.poll() is None:
+                    proc.kill()
+                raise
+            with os.fdopen(tx_fd, "r") as requests, os.fdopen(rx_fd, "w") as replies:
+                for line in requests:
+                    if (reply := bus.handle(line)) is not None:
+                        replies.write(reply)
+                        replies.flush()
+        except BrokenPipeError:
+            pass                                    # simulator went away mid-batch
+        finally:
+            bus.close()
+            code = proc.wait()
+            console.join()
+        return code
+
+# 4.  CLI
+@click.group()
+def cli():
+    """Co-simulation with Python peripheral models on ports $F0-$FF."""
+
+@cli.command("run")
+@click.argument("program")
+@click.option("--attach", "-a", multiple=True, help="Peripheral kind@PORT[=arg] (repeatable)")
+@click.option("--batch", default=DEFAULT_BATCH, show_default=True, help="Cycles between syncs")
+@click.option("--cycles", "-n", default=1000, show_default=True, help="Maximum simulation cycles")
+@click.option("--backend", "-b", type=click.Choice(list(BACKENDS)), default=DEFAULT_BACKEND,
+              show_default=True, help="Simulator back-end")
+@click.option("--prefetch", is_flag=True, help="Simulate the overlapped-fetch CPU variant")
+@click.option("--no-compile", is_flag=True, help="Reuse the existing testbench image")
+def run_cmd(program: str, attach: tuple, batch: int, cycles: int, backend: str, prefetch: bool,
+            no_compile: bool):
+    """Simulate PROGRAM with the attached peripheral models."""
+    sim = get_backend(backend)
+    opts = simulator.SimOptions(cycles=cycles, prefetch=prefetch)
+    try:
+        bus = PortBus([parse_attach(spec) for spec in attach])
+        program = simulator.resolve_program(program)
+        if not no_compile:
+            simulator.compile_testbench(sim, defines=opts.defines)
+        sim_args = simulator.build_simulation_args(program, sim.image_for(opts.defines), opts)
+        code = run_cosim(sim_args, bus, batch, sim)
+    except AsmError as e:
+        click.echo(f"Assembler error: {e}", err=True)
+        sys.exit(1)
+    except (CosimError, simulator.SimError) as e:
+        click.echo(f"Co-simulation error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"[cosim] {bus.transactions} port transactions in {bus.syncs} syncs", err=True)
+    sys.exit(code)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,173 @@
+"""
+coverage.py
+ISA coverage databases for the 8-But MightyController.
+
+A run with +COVERAGE=file writes one compact text database: a header line
+and six tables of 256 fixed-width hex fields
+• O  instructions executed, by opcode
+• T  branches taken, by opcode       N  branches not taken, by opcode
+• F  NZVC results produced, by opcode (bit v set = flags value v was seen)
+• R  data reads, by address          W  data writes, by address
+Because every field has a fixed width, merging thousands of databases is a
+single pass: each table of every file is concatenated and decoded with one
+bytes.fromhex / NumPy call, then summed (flags OR-ed) along the run axis.
+
+Usage
+─────
+$ python MightyController.py run test2(ALU) --coverage Programs/build/test2.cov
+$ python coverage.py merge all.cov runs/
+$ python coverage.py report runs/ "Programs/build/test2.cov"
+"""
+from __future__ import annotations
+
+import pathlib, re, sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+import click
+import numpy as np
+
+from assembler import BRANCHES, OPCODES
+
+# tag -> (hex digits per field, dtype)
+TABLES = {
+    "O": (8, ">u4"), "T": (8, ">u4"), "N": (8, ">u4"),
+    "F": (4, ">u2"), "R": (8, ">u4"), "W": (8, ">u4"),
+}
+HEADER_RE  = re.compile(r"^# coverage runs=(\d+) cycles=(\d+)$")
+RAM_RANGE  = range(0x80, 0xE0)
+PORT_RANGE = range(0xF0, 0x100)
+FLAG_NAMES = "NZVC"                          # bit 3 .. bit 0 of the CCR
+
+class CoverageError(ValueError):
+    pass
+
+# 1.  Database
+@dataclass
+class Coverage:
+    runs:   int
+    cycles: int
+    tables: Dict[str, np.ndarray]            # tag -> (256,) counts (uint64) or flag masks
+
+    def save(self, path: str | pathlib.Path):
+        lines = [f"# coverage runs={self.runs} cycles={self.cycles}"]
+        for tag, (width, _) in TABLES.items():
+            values = np.minimum(self.tables[tag], (1 << 4 * width) - 1)     # saturate, keep the field width
+            lines.append(f"{tag} " + "".join(f"{int(v):0{width}x}" for v in values))
+        pathlib.Path(path).write_text("\n".join(lines) + "\n", encoding="ascii")
+
+def db_paths(targets: List[str]) -> List[pathlib.Path]:
+    """Expand files and directories (all *.cov inside)."""
+    paths: List[pathlib.Path] = []
+    for t in map(pathlib.Path, targets):
+        paths.extend(sorted(t.glob("*.cov")) if t.is_dir() else [t])
+    return paths
+
+def merge(paths: List[pathlib.Path]) -> Coverage:
+    """Merge any number of databases (single runs or earlier merges) in one pass."""
+    if not paths:
+        raise CoverageError("no coverage databases given")
+    runs = cycles = 0
+    hexes: Dict[str, List[str]] = {tag: [] for tag in TABLES}
+    for path in paths:
+        lines = path.read_text(encoding="ascii").split("\n")
+        if not (m := HEADER_RE.match(lines[0])):
+            raise CoverageError(f"{path}: not a coverage database")
+        runs, cycles = runs + int(m.group(1)), cycles + int(m.group(2))
+        body = {ln[0]: ln[2:] for ln in lines[1:] if ln}
+        for tag, (width, _) in TABLES.items():
+            field = body.get(tag, "")
+            if len(field) != 256 * width:
+                raise CoverageError(f"{path}: table {tag} is truncated")
+            hexes[tag].append(field)
+
+    tables = {}
+    for tag, (_, dtype) in TABLES.items():
+        counts = np.frombuffer(bytes.fromhex("".join(hexes[tag])), dtype=dtype).reshape(len(paths), 256)
+        tables[tag] = (np.bitwise_or.reduce(counts, axis=0) if tag == "F"
+                       else counts.sum(axis=0, dtype=np.uint64))
+    return Coverage(runs, cycles, tables)
+
+# 2.  Report
+FLAG_SETTERS = {key: opc for key, opc in OPCODES.items() if opc.mode in ("REG", "IMP")}
+
+def _ranges(addrs: List[int]) -> str:
+    """$80-$8F, $92 style summary of an address list."""
+    out, start = [], None
+    for i, a in enumerate(addrs):
+        if start is None:
+            start = a
+        if i + 1 == len(addrs) or addrs[i + 1] != a + 1:
+            out.append(f"${start:02X}" if start == a else f"${start:02X}-${a:02X}")
+            start = None
+    return ", ".join(out)
+
+def report(cov: Coverage) -> List[str]:
+    ops, taken, not_taken = cov.tables["O"], cov.tables["T"], cov.tables["N"]
+    lines = [f"Coverage of {cov.runs} run(s), {cov.cycles} cycles"]
+
+    covered = [(m, mode) for (m, mode), opc in OPCODES.items() if ops[opc.code]]
+    lines.append(f"\nInstructions: {len(covered)}/{len(OPCODES)} opcode/mode pairs executed")
+    for (mnem, mode), opc in OPCODES.items():
+        mark = "  " if ops[opc.code] else "✗ "
+        lines.append(f"  {mark}{mnem:<4} {mode:<4} ${opc.code:02X}  {int(ops[opc.code]):>10}")
+
+    lines.append("\nBranches (taken / not taken):")
+    for (mnem, mode), opc in OPCODES.items():
+        if mnem in BRANCHES:
+            t, n = int(taken[opc.code]), int(not_taken[opc.code])
+            missing = [d for d, c in (("taken", t), ("not taken", n)) if not c]
+            lines.append(f"  {mnem:<4} {t:>8} / {n:<8}" + (f"  ✗ never {' or '.join(missing)}" if missing else ""))
+
+    lines.append("\nFlag outcomes:")
+    for (mnem, mode), opc in FLAG_SETTERS.items():
+        seen = int(cov.tables["F"][opc.code])
+        values = [v for v in range(16) if seen >> v & 1]
+        if not values:
+            lines.append(f"  {mnem:<4} not executed")
+            continue
+        never_set = [FLAG_NAMES[3 - b] for b in range(4) if not any(v >> b & 1 for v in values)]
+        never_clr = [FLAG_NAMES[3 - b] for b in range(4) if all(v >> b & 1 for v in values)]
+        lines.append(f"  {mnem:<4} never set: {''.join(sorted(never_set, key=FLAG_NAMES.index)) or '-':<5}"
+                     f" never cleared: {''.join(sorted(never_clr, key=FLAG_NAMES.index)) or '-'}")
+
+    touched = cov.tables["R"] + cov.tables["W"]
+    for name, window in (("RAM", RAM_RANGE), ("Ports", PORT_RANGE)):
+        hit = [a for a in window if touched[a]]
+        missed = [a for a in window if not touched[a]]
+        lines.append(f"\n{name}: {len(hit)}/{len(window)} addresses touched "
+                     f"({int(cov.tables['R'][list(window)].sum())} reads, {int(cov.tables['W'][list(window)].sum())} writes)")
+        if missed:
+            lines.append(f"  untouched: {_ranges(missed)}")
+    return lines
+
+# 3.  CLI
+@click.group()
+def cli():
+    """Coverage database merge and report."""
+
+def _merge(targets: tuple) -> Coverage:
+    try:
+        return merge(db_paths(list(targets)))
+    except CoverageError as e:
+        click.echo(f"Coverage error: {e}", err=True)
+        sys.exit(1)
+
+@cli.command("merge")
+@click.argument("out_path", type=click.Path(dir_okay=False))
+@click.argument("db_paths", nargs=-1, required=True, type=click.Path(exists=True))
+def merge_cmd(out_path: str, db_paths: tuple):
+    """Merge DB_PATHS (files or directories of *.cov) into OUT_PATH."""
+    cov = _merge(db_paths)
+    cov.save(out_path)
+    click.echo(f"[coverage] merged {cov.runs} run(s) -> {out_path}")
+
+@cli.command("report")
+@click.argument("db_paths", nargs=-1, required=True, type=click.Path(exists=True))
+def report_cmd(db_paths: tuple):
+    """Report covered and uncovered ISA features over DB_PATHS."""
+    for line in report(_merge(db_paths)):
+        click.echo(line)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,235 @@
+"""
+disassembler.py
+Bulk disassembler and ROM analyser for the 8-But MightyController.
+
+Every instruction is three bytes, so a batch of ROM images is decoded as
+one (images, 43, 3) NumPy array of instruction triples, zero-padded to the
+128-byte ROM plus one; the OPCODES table from the assembler is inverted into
+256-entry lookup arrays, so decoding, histograms, branch targets and the
+invalid-opcode report are array operations over the whole batch rather than
+per-byte Python loops. Only the text listing is formatted instruction by
+instruction.
+
+Usage
+─────
+$ python disassembler.py list "Programs/build/test4(BNE_BEQ).bin"
+$ python disassembler.py stats Programs/build
+$ python disassembler.py graph "Programs/build/test4(BNE_BEQ).bin" --dot
+$ python disassembler.py check corpus/ --quiet
+"""
+from __future__ import annotations
+
+import pathlib, sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+import click
+import numpy as np
+
+from assembler import BRANCHES, OPCODES, read_symbols
+
+ROM_SIZE   = 128
+SLOTS      = (ROM_SIZE + 2) // 3          # 43 instruction triples per image
+REG_NAMES  = "ABCDEFGHIJKLMNOP"
+
+# 1.  Inverse opcode table (256-entry lookups, indexed by opcode byte)
+MNEMONIC = np.full(256, "", dtype=object)
+MODE     = np.full(256, "", dtype=object)
+for (_mnem, _mode), _opc in OPCODES.items():
+    MNEMONIC[_opc.code], MODE[_opc.code] = _mnem, _mode
+VALID     = MNEMONIC != ""
+IS_BRANCH = np.isin(MNEMONIC, sorted(BRANCHES))
+# operand bytes that must name a register (b1 for IMP/IMM/DIR/REG, b2 for REG)
+REG_B1    = np.isin(MODE, ["IMP", "IMM", "DIR", "REG"])
+REG_B2    = MODE == "REG"
+
+class DisasmError(ValueError):
+    pass
+
+# 2.  Loading
+@dataclass
+class RomBatch:
+    names:   List[str]
+    triples: np.ndarray      # (images, SLOTS, 3) uint8
+    lengths: np.ndarray      # (images,) image size in bytes
+
+    @property
+    def present(self) -> np.ndarray:
+        """(images, SLOTS) mask of complete instructions inside each image."""
+        return (np.arange(SLOTS) * 3 + 3)[None, :] <= self.lengths[:, None]
+
+    @property
+    def opcodes(self) -> np.ndarray:
+        return self.triples[:, :, 0]
+
+def rom_paths(targets: List[str]) -> List[pathlib.Path]:
+    """Expand files and directories (all *.bin except RAM-init images)."""
+    paths: List[pathlib.Path] = []
+    for t in map(pathlib.Path, targets):
+        found = sorted(t.glob("*.bin")) if t.is_dir() else [t]
+        paths.extend(p for p in found if not p.name.endswith(".ram.bin"))
+    return paths
+
+def load_batch(paths: List[pathlib.Path]) -> RomBatch:
+    buf = np.zeros((len(paths), SLOTS * 3), dtype=np.uint8)
+    lengths = np.zeros(len(paths), dtype=np.int64)
+    for i, p in enumerate(paths):
+        data = p.read_bytes()
+        if len(data) > ROM_SIZE:
+            raise DisasmError(f"{p}: {len(data)} bytes does not fit the {ROM_SIZE}-byte ROM")
+        buf[i, :len(data)] = np.frombuffer(data, dtype=np.uint8)
+        lengths[i] = len(data)
+    return RomBatch([str(p) for p in paths], buf.reshape(len(paths), SLOTS, 3), lengths)
+
+# 3.  Analyses
+def opcode_histogram(batch: RomBatch) -> np.ndarray:
+    """(images, 256) count of each opcode byte over the complete instructions."""
+    n = len(batch.names)
+    rows = np.broadcast_to(np.arange(n)[:, None], batch.opcodes.shape)
+    sel = batch.present
+    flat = rows[sel].astype(np.int64) * 256 + batch.opcodes[sel]
+    return np.bincount(flat, minlength=n * 256).reshape(n, 256)
+
+def branch_edges(batch: RomBatch) -> np.ndarray:
+    """(k, 3) array of (image, source address, target address) for every branch."""
+    sel = batch.present & IS_BRANCH[batch.opcodes]
+    img, slot = np.nonzero(sel)
+    src = slot * 3
+    offset = batch.triples[img, slot, 1].astype(np.int8).astype(np.int64)
+    dst = (src + 3 + offset) & 0xFF          # offsets are relative to the next instruction
+    return np.stack([img, src, dst], axis=1)
+
+def problems(batch: RomBatch) -> Dict[str, np.ndarray]:
+    """(k, 2) rows of (image, address) for each kind of decoding problem."""
+    ops, present = batch.opcodes, batch.present
+    b1, b2 = batch.triples[:, :, 1], batch.triples[:, :, 2]
+    slots = lambda mask: np.stack([np.nonzero(mask)[0], np.nonzero(mask)[1] * 3], axis=1)
+    edges = branch_edges(batch)
+    inside = edges[:, 2] <= batch.lengths[edges[:, 0]]    # a label just past the code is a halt target
+    trailing = np.nonzero(batch.lengths % 3)[0]
+    return {
+        "invalid opcode":    slots(present & ~VALID[ops]),
+        "bad register":      slots(present & ((REG_B1[ops] & (b1 > 15)) | (REG_B2[ops] & (b2 > 15)))),
+        "branch off image":  edges[~inside][:, :2],
+        "branch misaligned": edges[inside & (edges[:, 2] % 3 != 0)][:, :2],
+        "trailing bytes":    np.stack([trailing, batch.lengths[trailing] // 3 * 3], axis=1),
+    }
+
+# 4.  Listing
+def _operand_text(mnem: str, mode: str, b1: int, b2: int, addr: int, labels: Dict[int, str]) -> str:
+    reg = REG_NAMES[b1] if b1 < 16 else f"?{b1:02X}"
+    if mode == "IMP":
+        return reg
+    if mode == "REG":
+        return f"{reg}, {REG_NAMES[b2] if b2 < 16 else f'?{b2:02X}'}"
+    if mode == "IMM":
+        return f"{reg}, #${b2:02X}"
+    if mode == "DIR":
+        return f"{reg}, {labels.get(b2, f'${b2:02X}')}"
+    target = (addr + 3 + (b1 - 256 if b1 > 127 else b1)) & 0xFF
+    return labels.get(target, f"${target:02X}")
+
+def listing(batch: RomBatch, index: int, symbols: Dict[str, int] | None = None) -> List[str]:
+    """Assembler-style listing of one image of the batch."""
+    labels = {addr: name for name, addr in (symbols or {}).items()}
+    length = int(batch.lengths[index])
+    lines = []
+    for slot in np.nonzero(batch.present[index])[0]:
+        addr = int(slot) * 3
+        op, b1, b2 = (int(b) for b in batch.triples[index, slot])
+        raw = f"{op:02X} {b1:02X} {b2:02X}"
+        label = f"{labels[addr]}:" if addr in labels else ""
+        if VALID[op]:
+            text = f"{MNEMONIC[op]} {_operand_text(MNEMONIC[op], MODE[op], b1, b2, addr, labels)}"
+        else:
+            text = f"DB ${op:02X}, ${b1:02X}, ${b2:02X}   // invalid opcode"
+        lines.append(f"{addr:02X}  {raw}  {label:<10}{text}")
+    tail = batch.triples[index].reshape(-1)[length - length % 3:length]
+    if len(tail):
+        lines.append(f"{length - len(tail):02X}  {' '.join(f'{b:02X}' for b in tail):<8}  "
+                     f"{'':<10}DB {', '.join(f'${b:02X}' for b in tail)}")
+    return lines
+
+# 5.  CLI
+@click.group()
+def cli():
+    """ROM image disassembler and bulk analyser."""
+
+def _load(targets: tuple) -> RomBatch:
+    paths = rom_paths(list(targets) or ["Programs/build"])
+    if not paths:
+        click.echo("Disassembler error: no ROM images found", err=True)
+        sys.exit(1)
+    try:
+        return load_batch(paths)
+    except DisasmError as e:
+        click.echo(f"Disassembler error: {e}", err=True)
+        sys.exit(1)
+
+@cli.command("list")
+@click.argument("rom_paths", nargs=-1, type=click.Path(exists=True))
+def list_cmd(rom_paths: tuple):
+    """Print a listing for each image (labels from a .sym file next to it)."""
+    batch = _load(rom_paths)
+    for i, name in enumerate(batch.names):
+        sym = pathlib.Path(name).with_suffix(".sym")
+        click.echo(f"; {name}")
+        for line in listing(batch, i, read_symbols(sym) if sym.exists() else None):
+            click.echo(line)
+        click.echo("")
+
+@cli.command("stats")
+@click.argument("rom_paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--per-image", is_flag=True, help="One histogram row per image")
+def stats_cmd(rom_paths: tuple, per_image: bool):
+    """Opcode histogram over all images (default: Programs/build)."""
+    batch = _load(rom_paths)
+    hist = opcode_histogram(batch)
+    used = np.nonzero(hist.sum(axis=0))[0]
+    names = [MNEMONIC[op] or f"?{op:02X}" for op in used]
+    click.echo(f"[disassembler] {len(batch.names)} images, {int(batch.present.sum())} instructions")
+    if per_image:
+        click.echo(f"{'image':<32}" + "".join(f"{f'{n}:{op:02X}':>8}" for op, n in zip(used, names)))
+        for name, row in zip(batch.names, hist[:, used]):
+            click.echo(f"{pathlib.Path(name).name[:31]:<32}" + "".join(f"{c:>8}" for c in row))
+    else:
+        total = hist.sum(axis=0)
+        for op, name in sorted(zip(used, names), key=lambda t: -total[t[0]]):
+            click.echo(f"  {op:02X} {name:<4} {total[op]:>8}")
+
+@cli.command("graph")
+@click.argument("rom_paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--dot", is_flag=True, help="Emit Graphviz DOT instead of plain edges")
+def graph_cmd(rom_paths: tuple, dot: bool):
+    """Branch source -> target edges for each image."""
+    batch = _load(rom_paths)
+    edges = branch_edges(batch)
+    if dot:
+        click.echo("digraph branches {")
+    for img, src, dst in edges:
+        name = pathlib.Path(batch.names[img]).stem
+        mnem = MNEMONIC[batch.opcodes[img, src // 3]]
+        if dot:
+            click.echo(f'  "{name}:{src:02X}" -> "{name}:{dst:02X}" [label="{mnem}"];')
+        else:
+            click.echo(f"{name}  {src:02X} -> {dst:02X}  {mnem}")
+    if dot:
+        click.echo("}")
+
+@cli.command("check")
+@click.argument("rom_paths", nargs=-1, type=click.Path(exists=True))
+@click.option("--quiet", "-q", is_flag=True, help="Only print the per-problem totals")
+def check_cmd(rom_paths: tuple, quiet: bool):
+    """Report invalid opcodes, bad registers and stray branches; exit 1 if any."""
+    batch = _load(rom_paths)
+    found = 0
+    for kind, rows in problems(batch).items():
+        found += len(rows)
+        click.echo(f"[disassembler] {kind}: {len(rows)}")
+        if not quiet:
+            for img, addr in rows:
+                click.echo(f"    {batch.names[img]} @ ${addr:02X}")
+    sys.exit(1 if found else 0)
+
+if __name__ == "__main__":
+    cli()
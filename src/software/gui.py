@@ -0,0 +1,1082 @@
+"""
+gui.py
+PyQt6 front-end for the 8-But MightyController. Launched by MightyController.py;
+orchestration lives in simulator.py so it can also run headless.
+"""
+import os, sys
+from pathlib import Path
+from PyQt6.QtWidgets import *
+from PyQt6.QtCore import Qt, QProcess, QTimer
+from PyQt6.QtGui import QTextCursor, QColor
+
+import simulator
+from backends import BACKENDS, DEFAULT_BACKEND, available_backends, get_backend
+from triggers import TriggerError
+import coverage
+from perf import PerfError, format_report, parse_perf
+from simcache import SimCache, cache_key, wave_stamp
+from recording import (Recording, RecordError, MachineState,
+                       REG_NAMES, RAM_BASE, RAM_SIZE, PORT_BASE)
+
+STATE_PANEL_FPS = 30  # Cap on live state repaints, however fast the simulation streams
+
+
+class StatePanel(QWidget):
+    """Registers, NZVC flags, RAM and output ports of one machine state"""
+
+    CHANGED = QColor("#264f78")
+
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.summary = QLabel()
+        self.summary.setObjectName("stateSummary")
+        layout.addWidget(self.summary)
+
+        # 16 registers in two rows of eight
+        reg_grid = QGridLayout()
+        reg_grid.setSpacing(4)
+        self.reg_labels = []
+        for i, name in enumerate(REG_NAMES):
+            label = QLabel()
+            label.setObjectName("regValue")
+            reg_grid.addWidget(label, i // 8, i % 8)
+            self.reg_labels.append(label)
+        layout.addLayout(reg_grid)
+
+        self.ram_table = self._hex_table(RAM_SIZE // 16, [f"${RAM_BASE + r * 16:02X}" for r in range(RAM_SIZE // 16)])
+        self.port_table = self._hex_table(1, [f"${PORT_BASE:02X}"])
+        layout.addWidget(QLabel("RAM ($80-$DF)"))
+        layout.addWidget(self.ram_table)
+        layout.addWidget(QLabel("Output Ports ($F0-$FF)"))
+        layout.addWidget(self.port_table)
+
+        self.shown = None
+        self.show_state(MachineState())
+
+    def _hex_table(self, rows: int, row_labels: list) -> QTableWidget:
+        table = QTableWidget(rows, 16)
+        table.setHorizontalHeaderLabels([f"{c:X}" for c in range(16)])
+        table.setVerticalHeaderLabels(row_labels)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setDefaultSectionSize(22)
+        table.setFixedHeight(24 + rows * 22 + 4)
+        for r in range(rows):
+            for c in range(16):
+                item = QTableWidgetItem("00")
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                table.setItem(r, c, item)
+        return table
+
+    def show_state(self, st: MachineState):
+        """Paint `st`, touching only cells that differ from what is on screen"""
+        prev = self.shown
+        self.summary.setText(f"Cycle {st.cycle}   PC=0x{st.pc:02X}   IR=0x{st.ir:02X}   "
+                             f"Flags={st.flags}   State={st.state_name}")
+        for i, label in enumerate(self.reg_labels):
+            if prev is None or prev.regs[i] != st.regs[i]:
+                label.setText(f"{REG_NAMES[i]}={st.regs[i]:02X}")
+        for table, old, new in [(self.ram_table, prev and prev.ram, st.ram),
+                                (self.port_table, prev and prev.ports, st.ports)]:
+            for idx, val in enumerate(new):
+                item = table.item(idx // 16, idx % 16)
+                changed = old is not None and old[idx] != val
+                if old is None or changed:
+                    item.setText(f"{val:02X}")
+                item.setBackground(self.CHANGED if changed else QColor(Qt.GlobalColor.transparent))
+        self.shown = st.copy()
+
+
+class MainWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("8-But MightyController - Assembly & Simulation Tool")
+        self.resize(1400, 900)  # Increased default size
+        self.setMinimumSize(1200, 700)  # Set minimum size to prevent crushing
+        self.setStyleSheet(self._get_styles())
+        
+        # Main layout
+        main_layout = QHBoxLayout(self)
+        main_layout.setContentsMargins(10, 10, 10, 10)  # Reduced margins
+        main_layout.setSpacing(10)
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        main_layout.addWidget(splitter)
+        
+        splitter.addWidget(self._create_left_panel())
+        splitter.addWidget(self._create_right_panel())
+        splitter.setSizes([500, 900])  # Better proportions
+        splitter.setStretchFactor(0, 0)  # Left panel doesn't stretch
+        splitter.setStretchFactor(1, 1)  # Right panel stretches
+        
+        # Initialize
+        self.has_file = False
+        self.selected_file = None
+        self.file_name = None
+        self.record_path = None
+        self.coverage_path = None
+        self.recording = None
+        self.busy_buttons = []
+        self.live_state = MachineState()
+        self.live_dirty = False
+        self.sim_partial = ""
+        self.sim_cache = SimCache()
+        self.sim_key = None
+        self.sim_args = []
+        self.sim_output = []
+        self.perf_lines = []
+        self.wave_file = "waves.vcd"
+        self.waves_before = None
+        self._setup_processes()
+        self._connect_signals()
+        self._populate_existing_programs()
+        self._set_status("Ready", "success")
+
+    def _get_styles(self):
+        return """
+            QMainWindow, QWidget { 
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #f8f9fa, stop:1 #e9ecef);
+                color: #2c3e50; 
+                font-family: 'Segoe UI', 'SF Pro Display', system-ui, sans-serif; 
+                font-size: 14px;
+            }
+            QGroupBox { 
+                border: 2px solid #3498db; 
+                border-radius: 12px; 
+                margin-top: 20px; 
+                padding-top: 20px; 
+                font-weight: 600;
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #ffffff, stop:1 #f8f9fa);
+            }
+            QGroupBox::title { 
+                subcontrol-origin: margin; 
+                left: 20px; 
+                padding: 0 12px;
+                color: #3498db;
+                font-size: 15px;
+                font-weight: 700;
+            }
+            QPushButton { 
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #3498db, stop:1 #2980b9);
+                border: none;
+                color: white;
+                padding: 12px 24px; 
+                border-radius: 8px; 
+                font-weight: 600;
+                font-size: 14px;
+                min-height: 20px;
+            }
+            QPushButton:hover { 
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #5dade2, stop:1 #3498db);
+            }
+            QPushButton:pressed { 
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #2980b9, stop:1 #1f618d);
+            }
+            QPushButton:disabled {
+                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #ecf0f1, stop:1 #d5dbdb);
+                color: #95a5a6;
+                border: 1px solid #bdc3c7;
+            }
+            QTextEdit { 
+                background: #1e1e1e; 
+                color: #d4d4d4;
+                border: 2px solid #333333;
+                border-radius: 8px;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 12px;
+                padding: 12px;
+                selection-background-color: #264f78;
+            }
+            QComboBox { 
+                padding: 10px 16px; 
+                border: 2px solid #3498db; 
+                border-radius: 8px; 
+                background: white;
+                font-size: 14px;
+                min-height: 20px;
+            }
+            QComboBox:hover {
+                border-color: #5dade2;
+            }
+            QComboBox::drop-down {
+                border: none;
+                width: 30px;
+            }
+            QComboBox::down-arrow {
+                image: none;
+                border: 2px solid #3498db;
+                width: 8px;
+                height: 8px;
+                border-radius: 2px;
+            }
+            QLabel {
+                color: #2c3e50;
+                font-weight: 500;
+                background: transparent;
+            }
+            #fileStatus {
+                color: #7f8c8d;
+                font-style: italic;
+                background: transparent;
+            }
+            #orSeparator {
+                color: #7f8c8d;
+                font-style: italic;
+                margin: 5px;
+                background: transparent;
+            }
+            #fileSelected {
+                color: #27ae60;
+                font-weight: bold;
+                background: transparent;
+            }
+            #status { 
+                font-weight: 700; 
+                padding: 12px 20px; 
+                border-radius: 8px;
+                font-size: 14px;
+                border: none;
+                background: rgba(236, 240, 241, 0.3);  /* Light transparent gray */
+                color: #2c3e50;
+            }
+            #status[class="success"] {
+                background: rgba(213, 244, 230, 0.4);  /* Light transparent green */
+                color: #1e8449;  /* Darker green for better contrast */
+                border: 1px solid rgba(39, 174, 96, 0.3);
+            }
+            #status[class="error"] {
+                background: rgba(248, 215, 218, 0.4);  /* Light transparent red */
+                color: #c0392b;  /* Darker red for better contrast */
+                border: 1px solid rgba(231, 76, 60, 0.3);
+            }
+            #status[class="working"] {
+                background: rgba(255, 243, 205, 0.4);  /* Light transparent orange */
+                color: #d68910;  /* Darker orange for better contrast */
+                border: 1px solid rgba(243, 156, 18, 0.3);
+            }
+            #title { 
+                color: #2c3e50; 
+                font-size: 28px; 
+                font-weight: 700;
+                margin-bottom: 8px;
+            }
+            #subtitle {
+                color: #7f8c8d;
+                font-size: 16px;
+                font-weight: 400;
+                margin-bottom: 20px;
+            }
+            #stateSummary, #regValue {
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 13px;
+            }
+            QTableWidget {
+                background: #1e1e1e;
+                color: #d4d4d4;
+                gridline-color: #333333;
+                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+                font-size: 12px;
+            }
+            #consoleHeader {
+                color: #2c3e50;
+                font-size: 18px;
+                font-weight: 600;
+                margin-bottom: 10px;
+            }
+            QSplitter::handle {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                    stop:0 #e0e0e0, stop:0.5 #3498db, stop:1 #e0e0e0);
+                width: 4px;
+                border-radius: 2px;
+            }
+            QSplitter::handle:hover {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                    stop:0 #3498db, stop:0.5 #2980b9, stop:1 #3498db);
+            }
+            QSplitter::handle:pressed {
+                background: #2980b9;
+            }
+            QSpinBox {
+                padding: 5px 8px;
+                border: 2px solid #3498db;
+                border-radius: 4px;
+                background: white;
+                font-size: 12px;
+                min-height: 20px;
+            }
+            QSpinBox:focus {
+                border-color: #5dade2;
+            }
+            QCheckBox {
+                color: #2c3e50;
+                font-size: 13px;  /* Slightly larger font */
+                spacing: 6px;     /* More spacing */
+                min-height: 22px; /* Bigger minimum height */
+                padding: 2px;     /* Add some padding */
+            }
+            QCheckBox::indicator {
+                width: 18px;      /* Bigger checkbox */
+                height: 18px;
+                border: 2px solid #3498db;
+                border-radius: 3px;
+                background: white;
+            }
+            QCheckBox::indicator:checked {
+                background: #3498db;
+                image: none;
+                border: 2px solid #2980b9;
+            }
+            QScrollArea {
+                border: none;
+                background: transparent;
+            }
+        """
+
+    def _create_left_panel(self):
+        panel = QFrame()
+        panel.setMinimumWidth(450)  
+        panel.setMaximumWidth(600)  # Maximum width to prevent over-expansion
+        layout = QVBoxLayout(panel)
+        layout.setSpacing(12)  # Reduced spacing
+
+        # Header
+        title = QLabel("8-But MightyController")
+        title.setObjectName("title")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        subtitle = QLabel("Assembly & Simulation Tool")
+        subtitle.setObjectName("subtitle")
+        subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        layout.addWidget(title)
+        layout.addWidget(subtitle)
+
+        # File Selection
+        file_group = QGroupBox("File Selection")
+        file_layout = QVBoxLayout(file_group)
+        file_layout.setSpacing(8)  
+        
+        # New file selection
+        new_file_row = QHBoxLayout()
+        self.file_btn = QPushButton("Select ASM File")
+        self.file_btn.setFixedHeight(35) 
+        self.file_label = QLabel("No file selected")
+        self.file_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.file_label.setObjectName("fileStatus")
+        new_file_row.addWidget(self.file_btn)
+        new_file_row.addWidget(self.file_label, 1)
+        file_layout.addLayout(new_file_row)
+
+        # OR separator
+        or_label = QLabel("— OR —")
+        or_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        or_label.setObjectName("orSeparator")
+        file_layout.addWidget(or_label)
+
+        # Existing programs dropdown
+        existing_row = QHBoxLayout()
+        existing_row.addWidget(QLabel("Quick Run:"))
+        self.existing_combo = QComboBox()
+        self.existing_combo.setFixedHeight(30)  
+        self.quick_run_btn = QPushButton("Run")
+        self.quick_run_btn.setFixedSize(80, 30) 
+        self.quick_run_btn.setEnabled(True)
+        existing_row.addWidget(self.existing_combo, 1)
+        existing_row.addWidget(self.quick_run_btn)
+        file_layout.addLayout(existing_row)
+
+        layout.addWidget(file_group)
+
+        # Actions
+        actions_group = QGroupBox("Actions")
+        actions_layout = QVBoxLayout(actions_group)
+        actions_layout.setSpacing(8) 
+        
+        self.assemble_btn = QPushButton("Assemble Code")
+        self.assemble_btn.setFixedHeight(35) 
+        self.assemble_btn.setEnabled(False)
+        
+        self.simulate_btn = QPushButton("Compile & Simulate")
+        self.simulate_btn.setFixedHeight(35)
+        self.simulate_btn.setEnabled(False)
+        
+        self.wave_btn = QPushButton("Show Waveforms")
+        self.wave_btn.setFixedHeight(35)
+        self.wave_btn.setEnabled(False)
+
+        actions_layout.addWidget(self.assemble_btn)
+        actions_layout.addWidget(self.simulate_btn)
+        actions_layout.addWidget(self.wave_btn)
+
+        self.bypass_cache_check = QCheckBox("Bypass Result Cache")
+        actions_layout.addWidget(self.bypass_cache_check)
+
+        # Simulator back-end; back-ends whose tools are not installed stay listed but disabled
+        backend_row = QHBoxLayout()
+        backend_row.addWidget(QLabel("Simulator:"))
+        self.backend_combo = QComboBox()
+        installed = available_backends()
+        for name in BACKENDS:
+            self.backend_combo.addItem(name)
+            if name not in installed:
+                self.backend_combo.model().item(self.backend_combo.count() - 1).setEnabled(False)
+        self.backend_combo.setCurrentText(DEFAULT_BACKEND)
+        backend_row.addWidget(self.backend_combo)
+        actions_layout.addLayout(backend_row)
+
+        self.prefetch_check = QCheckBox("Prefetch (overlapped fetch)")
+        self.prefetch_check.setToolTip("Build the CPU variant that fetches the next instruction during execution")
+        actions_layout.addWidget(self.prefetch_check)
+        layout.addWidget(actions_group)
+
+        # Debug Options
+        debug_group = QGroupBox("Debug Options")
+        debug_layout = QVBoxLayout(debug_group)
+        debug_layout.setSpacing(8)  
+        
+        # Top row: Max Cycles and Presets
+        top_row = QHBoxLayout()
+        
+        # Max Cycles section (left side)
+        cycles_section = QHBoxLayout()
+        cycles_section.addWidget(QLabel("Max Cycles:"))
+        self.cycle_spin = QSpinBox()
+        self.cycle_spin.setRange(100, 50000)
+        self.cycle_spin.setValue(1000)
+        self.cycle_spin.setSingleStep(100)
+        self.cycle_spin.setFixedHeight(28) 
+        self.cycle_spin.setMinimumWidth(100)
+        cycles_section.addWidget(self.cycle_spin)
+        cycles_section.addStretch()
+        
+        # Presets section (right side)
+        presets_section = QHBoxLayout()
+        presets_section.addWidget(QLabel("Presets:"))
+        
+        self.preset_none_btn = QPushButton("None")
+        self.preset_full_btn = QPushButton("Full")
+        self.preset_none_btn.setToolTip("Debug off: runs use the fast testbench build (tb_fast.out)")
+        
+        # Smaller preset buttons
+        for btn in [self.preset_none_btn, self.preset_full_btn]:
+            btn.setFixedHeight(28)
+            btn.setMinimumWidth(90)
+            btn.setMaximumWidth(90)
+        
+        presets_section.addWidget(self.preset_none_btn)
+        presets_section.addWidget(self.preset_full_btn)
+        
+        # Add both sections to top row
+        top_row.addLayout(cycles_section)
+        top_row.addSpacing(20)  # Add some space between sections
+        top_row.addLayout(presets_section)
+        
+        debug_layout.addLayout(top_row)
+        
+        # Debug checkboxes in a grid (now with more space)
+        debug_checks_layout = QGridLayout()
+        debug_checks_layout.setSpacing(6)  # Increased spacing for bigger checkboxes
+        
+        self.debug_enable = QCheckBox("Enable Debug")
+        self.debug_pc = QCheckBox("Show PC")
+        self.debug_ir = QCheckBox("Show IR")
+        self.debug_regs = QCheckBox("Show Register Values")
+        self.debug_mem = QCheckBox("Show Memory")
+        self.debug_inner_workings = QCheckBox("See Inner Workings")
+        self.debug_state = QCheckBox("Show State")
+        self.debug_verbose = QCheckBox("Verbose Mode")
+        self.live_state_check = QCheckBox("Live State Panel")
+        
+        # Set defaults
+        self.debug_inner_workings.setChecked(False)  # Default to off since it shows detailed internal operations
+        
+        # Arrange in 2 columns with better sizing
+        debug_checks_layout.addWidget(self.debug_enable, 0, 0)
+        debug_checks_layout.addWidget(self.debug_pc, 0, 1)
+        debug_checks_layout.addWidget(self.debug_ir, 1, 0)
+        debug_checks_layout.addWidget(self.debug_regs, 1, 1)
+        debug_checks_layout.addWidget(self.debug_mem, 2, 0)
+        debug_checks_layout.addWidget(self.debug_inner_workings, 2, 1)
+        debug_checks_layout.addWidget(self.debug_state, 3, 0)
+        debug_checks_layout.addWidget(self.debug_verbose, 3, 1)
+        debug_checks_layout.addWidget(self.live_state_check, 4, 0)
+        
+        # Set column stretch to distribute evenly
+        debug_checks_layout.setColumnStretch(0, 1)
+        debug_checks_layout.setColumnStretch(1, 1)
+        
+        debug_layout.addLayout(debug_checks_layout)
+
+        # Recorded run (checkpoints + per-cycle deltas for time-travel debugging)
+        record_row = QHBoxLayout()
+        self.record_check = QCheckBox("Record Run")
+        self.checkpoint_spin = QSpinBox()
+        self.checkpoint_spin.setRange(10, 10000)
+        self.checkpoint_spin.setValue(1000)
+        self.checkpoint_spin.setSingleStep(100)
+        self.checkpoint_spin.setFixedHeight(28)
+        self.coverage_check = QCheckBox("Collect Coverage")
+        self.perf_check = QCheckBox("Perf Counters")
+        record_row.addWidget(self.record_check)
+        record_row.addWidget(self.coverage_check)
+        record_row.addWidget(self.perf_check)
+        record_row.addStretch()
+        record_row.addWidget(QLabel("Checkpoint every:"))
+        record_row.addWidget(self.checkpoint_spin)
+        debug_layout.addLayout(record_row)
+
+        # Trace triggers: debug output only between a start and a stop condition
+        trigger_grid = QGridLayout()
+        self.trace_start_edit = QLineEdit()
+        self.trace_start_edit.setPlaceholderText("e.g. pc:LOOP, reg:F=$00")
+        self.trace_stop_edit = QLineEdit()
+        self.trace_stop_edit.setPlaceholderText("e.g. write:$F0")
+        trigger_grid.addWidget(QLabel("Trace start:"), 0, 0)
+        trigger_grid.addWidget(self.trace_start_edit, 0, 1)
+        trigger_grid.addWidget(QLabel("Trace stop:"), 1, 0)
+        trigger_grid.addWidget(self.trace_stop_edit, 1, 1)
+        debug_layout.addLayout(trigger_grid)
+        
+        layout.addWidget(debug_group)
+
+        # Status
+        self.status_label = QLabel()
+        self.status_label.setObjectName("status")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setMaximumHeight(40) 
+        layout.addWidget(self.status_label)
+
+        layout.addStretch()  # Add stretch at the bottom
+        return panel
+
+    def _create_right_panel(self):
+        panel = QFrame()
+        layout = QVBoxLayout(panel)
+        layout.setSpacing(10)
+
+        # Console header with clear button
+        header_row = QHBoxLayout()
+        console_title = QLabel("Simulation Console")
+        console_title.setObjectName("consoleHeader")
+        header_row.addWidget(console_title)
+        
+        clear_btn = QPushButton("Clear")
+        clear_btn.setMaximumWidth(120)
+        clear_btn.setFixedHeight(35)
+        clear_btn.clicked.connect(lambda: self.console.clear())
+        header_row.addStretch()
+        header_row.addWidget(clear_btn)
+        layout.addLayout(header_row)
+
+        # Console
+        self.console = QTextEdit()
+        self.console.setReadOnly(True)
+        layout.addWidget(self.console)
+
+        # Machine state: live during a streamed run, or replayed from a recording
+        state_group = QGroupBox("Machine State")
+        state_layout = QVBoxLayout(state_group)
+        self.state_panel = StatePanel()
+        state_layout.addWidget(self.state_panel)
+
+        travel_row = QHBoxLayout()
+        self.step_back_btn = QPushButton("◀")
+        self.step_fwd_btn = QPushButton("▶")
+        for btn in [self.step_back_btn, self.step_fwd_btn]:
+            btn.setFixedSize(50, 30)
+        self.cycle_slider = QSlider(Qt.Orientation.Horizontal)
+        self.cycle_jump = QSpinBox()
+        self.cycle_jump.setFixedHeight(28)
+        self.cycle_jump.setMinimumWidth(100)
+        travel_row.addWidget(self.step_back_btn)
+        travel_row.addWidget(self.cycle_slider, 1)
+        travel_row.addWidget(self.step_fwd_btn)
+        travel_row.addWidget(QLabel("Cycle:"))
+        travel_row.addWidget(self.cycle_jump)
+        self.travel_widgets = [self.step_back_btn, self.cycle_slider, self.step_fwd_btn, self.cycle_jump]
+        for w in self.travel_widgets:
+            w.setEnabled(False)
+        state_layout.addLayout(travel_row)
+        layout.addWidget(state_group)
+
+        return panel
+
+    def _setup_processes(self):
+        self.proc_asm = QProcess(self)
+        self.proc_sim = QProcess(self)
+        self.proc_compile = QProcess(self)
+        self.proc_wave = QProcess(self)
+        for p in [self.proc_asm, self.proc_sim, self.proc_compile]:
+            p.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+
+        # State lines are folded into live_state as they arrive; the panel is repainted on this timer
+        self.state_timer = QTimer(self)
+        self.state_timer.setInterval(1000 // STATE_PANEL_FPS)
+        self.state_timer.timeout.connect(self._repaint_live_state)
+
+    def _connect_signals(self):
+        self.file_btn.clicked.connect(self._select_file)
+        self.assemble_btn.clicked.connect(self._assemble)
+        self.simulate_btn.clicked.connect(self._simulate)
+        self.wave_btn.clicked.connect(self._show_waves)
+        self.quick_run_btn.clicked.connect(self._quick_run)
+        self.existing_combo.currentTextChanged.connect(self._on_existing_changed)
+        
+        # Debug preset connections
+        self.preset_none_btn.clicked.connect(self._preset_none)
+        self.preset_full_btn.clicked.connect(self._preset_full)
+        
+        # Verbose mode auto-enables all debug options
+        self.debug_verbose.toggled.connect(self._on_verbose_changed)
+
+        # Time travel controls
+        self.cycle_slider.valueChanged.connect(self._show_cycle)
+        self.cycle_jump.valueChanged.connect(self.cycle_slider.setValue)
+        self.step_back_btn.clicked.connect(lambda: self.cycle_slider.setValue(self.cycle_slider.value() - 1))
+        self.step_fwd_btn.clicked.connect(lambda: self.cycle_slider.setValue(self.cycle_slider.value() + 1))
+
+    def _populate_existing_programs(self):
+        """Find existing binary files and populate dropdown"""
+        programs = simulator.discover_programs()
+        
+        self.existing_combo.clear()
+        if programs:
+            self.existing_combo.addItem("Select program...")
+            for name in programs:
+                self.existing_combo.addItem(name)
+        else:
+            self.existing_combo.addItem("No programs available")
+
+    def _on_existing_changed(self):
+        """Enable quick run button when program selected"""
+        current = self.existing_combo.currentText()
+        self.quick_run_btn.setEnabled(
+            current not in ["Select program...", "No programs available", ""]
+        )
+
+    def _preset_none(self):
+        """Disable all debug options"""
+        self.debug_enable.setChecked(False)
+        self.debug_pc.setChecked(False)
+        self.debug_ir.setChecked(False)
+        self.debug_regs.setChecked(False)
+        self.debug_mem.setChecked(False)
+        self.debug_inner_workings.setChecked(False)
+        self.debug_state.setChecked(False)
+        self.debug_verbose.setChecked(False)
+
+    def _preset_full(self):
+        """Enable all debug options"""
+        self.debug_enable.setChecked(True)
+        self.debug_pc.setChecked(True)
+        self.debug_ir.setChecked(True)
+        self.debug_regs.setChecked(True)
+        self.debug_mem.setChecked(True)
+        self.debug_inner_workings.setChecked(True)
+        self.debug_state.setChecked(True)
+        self.debug_verbose.setChecked(False)  # Don't auto-enable verbose
+
+    def _on_verbose_changed(self, checked):
+        """When verbose mode is enabled, enable all debug options"""
+        if checked:
+            self.debug_enable.setChecked(True)
+            self.debug_pc.setChecked(True)
+            self.debug_ir.setChecked(True)
+            self.debug_regs.setChecked(True)
+            self.debug_mem.setChecked(True)
+            self.debug_inner_workings.setChecked(True)
+            self.debug_state.setChecked(True)
+
+    def _set_status(self, msg: str, status_type: str = "normal"):
+        """Update status with enhanced styling based on type"""
+        self.status_label.setText(msg)
+        
+        # Map old color-based calls to new types
+        color_map = {
+            "#e74c3c": "error",
+            "#27ae60": "success", 
+            "#f39c12": "working",
+            "#3498db": "working"
+        }
+        
+        if status_type in color_map.values():
+            # New type-based call
+            self.status_label.setProperty("class", status_type)
+        elif status_type in color_map:
+            # Legacy color-based call - convert to type
+            self.status_label.setProperty("class", color_map[status_type])
+        else:
+            # Default
+            self.status_label.setProperty("class", "normal")
+            
+        # Force style refresh
+        self.status_label.style().unpolish(self.status_label)
+        self.status_label.style().polish(self.status_label)
+
+    def _log(self, msg: str):
+        self.console.moveCursor(QTextCursor.MoveOperation.End)
+        self.console.insertPlainText(msg + "\n")
+        self.console.moveCursor(QTextCursor.MoveOperation.End)
+
+    def _select_file(self):
+        file, _ = QFileDialog.getOpenFileName(
+            self, "Select Assembly File", "Programs/asm", "Assembly Files (*.asm);;Text Files (*.txt);;All Files (*)"
+        )
+        if file:
+            self.has_file = True
+            self.selected_file = file
+            self.file_name = Path(file).stem
+            self.file_label.setText(f"✅ {self.file_name}.asm")
+            self.file_label.setObjectName("fileSelected")
+            # Force style refresh
+            self.file_label.style().unpolish(self.file_label)
+            self.file_label.style().polish(self.file_label)
+            self.assemble_btn.setEnabled(True)
+            self._set_status("File selected", "#27ae60")
+
+    def _assemble(self):
+        """Assemble the selected ASM file"""
+        if not self.has_file:
+            return
+            
+        self.console.clear()
+        self._log("Assembling...")
+        self._set_status("Assembling...", "working")
+        
+        out_bin = str(simulator.bin_path(self.file_name))
+        
+        self.proc_asm.readyReadStandardOutput.connect(
+            lambda: self._log(bytes(self.proc_asm.readAllStandardOutput()).decode(errors="ignore").strip())
+        )
+        self.proc_asm.finished.connect(self._on_assemble_done)
+        self.proc_asm.start("python", ["src/software/assembler.py", "assemble", self.selected_file, "-o", out_bin])
+
+    def _on_assemble_done(self):
+        """Handle assembly completion"""
+        ok = self.proc_asm.exitCode() == 0
+        self._set_status("Assembly Complete ✅" if ok else "Assembly Failed ❌", 
+                        "success" if ok else "error")
+        if ok:
+            self._log("Assembly successful!")
+            self.simulate_btn.setEnabled(True)
+            self._populate_existing_programs()  # Refresh dropdown
+        else:
+            self._log("Assembly failed!")
+        self._disconnect_process_signals(self.proc_asm)
+
+    def _disconnect_process_signals(self, process):
+        """Helper to safely disconnect process signals"""
+        try:
+            process.readyReadStandardOutput.disconnect()
+            process.finished.disconnect()
+        except TypeError:
+            pass  # Signals already disconnected
+
+    def _simulate(self):
+        self._run_simulation(self.file_name)
+
+    def _quick_run(self):
+        """Run simulation for selected existing program"""
+        program = self.existing_combo.currentText()
+        if program not in ["Select program...", "No programs available", ""]:
+            self._run_simulation(program)
+
+    def _set_run_buttons(self, enabled: bool):
+        """Block Run / Simulate while a testbench build is in progress"""
+        if not enabled:
+            self.busy_buttons = [b for b in (self.simulate_btn, self.quick_run_btn) if b.isEnabled()]
+        for b in self.busy_buttons:
+            b.setEnabled(enabled)
+
+    def _compile_testbench(self, on_done):
+        """Build the testbench image in the background; on_done() runs once it succeeded"""
+        backend = self._backend()
+        defines = self._sim_options().defines
+        self._log(f"Compiling ({backend.name}{', ' + ', '.join(defines) if defines else ''}) …")
+        if "FAST" in defines:
+            self._log("Debug off: using the fast testbench build (no per-cycle debug logic)")
+        cmd = backend.compile_command(defines)
+        image = backend.image_for(defines)
+        image.parent.mkdir(parents=True, exist_ok=True)
+
+        self._set_run_buttons(False)
+        self.proc_compile.readyReadStandardOutput.connect(
+            lambda: self._log(bytes(self.proc_compile.readAllStandardOutput()).decode(errors="ignore").rstrip())
+        )
+        self.proc_compile.finished.connect(lambda: self._on_compile_done(image, on_done))
+        self.proc_compile.start(cmd[0], cmd[1:])
+
+    def _on_compile_done(self, image: Path, on_done):
+        """Handle testbench build completion"""
+        leftover = self.proc_compile.readAllStandardOutput()
+        if leftover:
+            self._log(bytes(leftover).decode(errors="ignore").rstrip())
+        ok = (self.proc_compile.exitStatus() == QProcess.ExitStatus.NormalExit
+              and self.proc_compile.exitCode() == 0)
+        self._disconnect_process_signals(self.proc_compile)
+        self._set_run_buttons(True)
+        self._set_status("Compilation OK ✅" if ok else "Compilation Failed ❌",
+                        "success" if ok else "error")
+        if ok:
+            image.touch()                              # mark it current (see backends.needs_build)
+            self.last_build = image.resolve()          # store for run step
+            on_done()
+
+    def _backend(self):
+        return get_backend(self.backend_combo.currentText())
+
+    def _sim_options(self) -> simulator.SimOptions:
+        """Collect the debug panel into simulator options"""
+        return simulator.SimOptions(
+            cycles=self.cycle_spin.value(),
+            debug=self.debug_enable.isChecked(),
+            pc=self.debug_pc.isChecked(),
+            ir=self.debug_ir.isChecked(),
+            regs=self.debug_regs.isChecked(),
+            mem=self.debug_mem.isChecked(),
+            inner=self.debug_inner_workings.isChecked(),
+            state=self.debug_state.isChecked(),
+            verbose=self.debug_verbose.isChecked(),
+            record=self.record_path,
+            coverage=self.coverage_path,
+            perf=self.perf_check.isChecked(),
+            prefetch=self.prefetch_check.isChecked(),
+            checkpoint=self.checkpoint_spin.value(),
+            state_stream=self.live_state_check.isChecked(),
+            trace_start=self._trigger_specs(self.trace_start_edit),
+            trace_stop=self._trigger_specs(self.trace_stop_edit),
+        )
+
+    @staticmethod
+    def _trigger_specs(edit: QLineEdit) -> list:
+        return [spec.strip() for spec in edit.text().split(",") if spec.strip()]
+    
+    def _build_simulation_args(self, program_name: str, testbench_file: Path) -> list:
+        """Build simulation arguments with debug options"""
+        self.record_path = None
+        if self.record_check.isChecked():
+            self.record_path = str(simulator.BUILD_DIR / f"{program_name}.rec")
+        self.coverage_path = None
+        if self.coverage_check.isChecked():
+            self.coverage_path = str(simulator.BUILD_DIR / f"{program_name}.cov")
+
+        opts = self._sim_options()
+        sim_args = simulator.build_simulation_args(program_name, testbench_file, opts)
+
+        if opts.debug:
+            enabled_flags = [flag for attr, flag, _ in simulator.DEBUG_FLAGS if getattr(opts, attr)]
+            self._log(f"Debug flags added: {enabled_flags}")
+        if opts.verbose:
+            self._log("Verbose debugging enabled")
+        if opts.debug:
+            self._log(f"Debug enabled: {', '.join(opts.active_debug)}")
+            
+        return sim_args
+
+    def _run_simulation(self, program_name: str):
+        """Run simulation for given program name with debug options"""
+        bin_file = simulator.bin_path(program_name)
+        if not bin_file.exists():
+            self._log(f"Binary file not found: {bin_file}")
+            self._set_status("Binary File Not Found ❌", "error")
+            return
+            
+        self.console.clear()
+        self._log("Starting enhanced simulation...")
+        self._set_status("Simulating...", "working")
+        
+        # Build simulation arguments; an identical earlier run is replayed from the cache
+        backend = self._backend()
+        testbench_file = backend.image_for(self._sim_options().defines)
+        try:
+            self.sim_args = self._build_simulation_args(program_name, testbench_file)
+        except TriggerError as e:
+            self._log(f"Trigger error: {e}")
+            self._set_status("Invalid Trace Trigger ❌", "error")
+            return
+        self.live_state = MachineState()
+        self.live_dirty = False
+        self.sim_partial = ""
+        self.sim_output = []
+        self.perf_lines = []
+        self.wave_file = "waves.vcd"
+
+        self.sim_key = None
+        if not self.bypass_cache_check.isChecked():
+            self.sim_key = cache_key(self.sim_args, backend.sources())
+            entry = self.sim_cache.lookup(self.sim_key)
+            if entry is not None:
+                self._replay_cached(entry)
+                return
+
+        # Compile testbench if it is out of date, then run the simulation
+        defines = self._sim_options().defines
+        if backend.needs_build(defines):
+            self._compile_testbench(lambda: self._start_simulation(backend))
+        else:
+            self.last_build = testbench_file.resolve()
+            self._start_simulation(backend)
+
+    def _start_simulation(self, backend):
+        """Start the simulator on the prepared arguments"""
+        self.proc_sim.readyReadStandardOutput.connect(self._on_sim_output)
+        self.proc_sim.finished.connect(self._on_sim_done)
+        self.state_timer.start()
+        self.waves_before = wave_stamp()
+        cmd = backend.run_command(self.sim_args)
+        self.proc_sim.start(cmd[0], cmd[1:])
+
+    def _replay_cached(self, entry):
+        """Show a cached run exactly as if the simulator had just produced it"""
+        self._log(f"Cache hit: replaying {entry.path}")
+        entry.restore_outputs()
+        self._feed_sim_text(entry.output)
+        self.wave_file = str(entry.wave_file) if entry.wave_file else ""
+        if entry.final_state:
+            self.live_state.apply(entry.final_state)
+            self.live_dirty = True
+        self._repaint_live_state()
+        self._finish_simulation(entry.exit_code == 0)
+
+    def _on_sim_output(self):
+        """Read the simulator's stdout; keep it for the result cache"""
+        chunk = bytes(self.proc_sim.readAllStandardOutput()).decode(errors="ignore")
+        if self.sim_key:
+            self.sim_output.append(chunk)
+        self._feed_sim_text(chunk)
+
+    def _feed_sim_text(self, chunk: str):
+        """Split simulator output into console text and machine-readable state lines"""
+        lines = (self.sim_partial + chunk).split("\n")
+        self.sim_partial = lines.pop()
+        text = []
+        for ln in lines:
+            if self.live_state.apply(ln):
+                self.live_dirty = True
+            elif ln.startswith("PERF "):
+                self.perf_lines.append(ln)          # shown as a report when the run ends
+            elif ln.strip():
+                text.append(ln.rstrip())
+        if text:
+            self._log("\n".join(text))
+
+    def _repaint_live_state(self):
+        if self.live_dirty:
+            self.live_dirty = False
+            self.state_panel.show_state(self.live_state)
+
+    def _on_sim_done(self):
+        """Handle simulation completion"""
+        self._on_sim_output()
+        if self.sim_partial:
+            self._feed_sim_text("\n")
+        self.state_timer.stop()
+        self._repaint_live_state()
+        ok = self.proc_sim.exitCode() == 0
+        if ok and self.sim_key:
+            self.sim_cache.store(self.sim_key, self.sim_args, "".join(self.sim_output), 0, self.waves_before)
+        if wave_stamp() == self.waves_before:
+            self.wave_file = ""                     # this run dumped no waves (e.g. Verilator)
+        self._disconnect_process_signals(self.proc_sim)
+        self._finish_simulation(ok)
+
+    def _finish_simulation(self, ok: bool):
+        """Common completion handling for live and cached runs"""
+        self._set_status("Simulation Complete ✅" if ok else "Simulation Failed ❌", 
+                        "success" if ok else "error")
+        if ok:
+            self._log("Simulation completed!")
+            self.wave_btn.setEnabled(True)
+            self._load_recording()
+            self._report_coverage()
+            self._report_perf()
+        else:
+            self._log("Simulation failed!")
+
+    def _report_perf(self):
+        """Append the CPI report built from the run's PERF counter lines"""
+        if not self.perf_lines:
+            return
+        try:
+            perf = parse_perf(self.perf_lines)
+        except PerfError as e:
+            self._log(f"Perf error: {e}")
+            return
+        self._log("\n".join(format_report(perf)))
+
+    def _report_coverage(self):
+        """Append the coverage report of this run to the console"""
+        if not self.coverage_path or not os.path.exists(self.coverage_path):
+            return
+        try:
+            cov = coverage.merge([Path(self.coverage_path)])
+        except coverage.CoverageError as e:
+            self._log(f"Coverage error: {e}")
+            return
+        for line in coverage.report(cov):
+            self._log(line)
+
+    def _load_recording(self):
+        """Load the recorded run (if any) into the time travel controls"""
+        self.recording = None
+        for w in self.travel_widgets:
+            w.setEnabled(False)
+        if not self.record_path or not os.path.exists(self.record_path):
+            return
+        try:
+            self.recording = Recording.load(self.record_path)
+        except RecordError as e:
+            self._log(f"Could not load recording: {e}")
+            return
+
+        first, last = self.recording.first_cycle, self.recording.last_cycle
+        for w in [self.cycle_slider, self.cycle_jump]:
+            w.blockSignals(True)
+            w.setRange(first, last)
+            w.setValue(last)
+            w.blockSignals(False)
+        for w in self.travel_widgets:
+            w.setEnabled(True)
+        self._show_cycle(last)
+        self._log(f"Recording loaded: cycles {first}..{last}, "
+                  f"{len(self.recording.checkpoints)} checkpoints")
+
+    def _show_cycle(self, cycle: int):
+        """Reconstruct and display the recorded state at the given cycle"""
+        if self.recording is None:
+            return
+        self.cycle_jump.blockSignals(True)
+        self.cycle_jump.setValue(cycle)
+        self.cycle_jump.blockSignals(False)
+        self.state_panel.show_state(self.recording.state_at(cycle))
+
+    def _show_waves(self):
+        """Open GTKWave to show simulation waveforms"""
+        if os.path.exists(self.wave_file):
+            self._log("Opening GTKWave...")
+            self.proc_wave.start("gtkwave", [self.wave_file])
+        else:
+            self._log("Wave file not found!")
+            self._set_status("Wave File Not Found ❌", "error")
+
+    def closeEvent(self, e):
+        for p in [self.proc_asm, self.proc_sim, self.proc_compile, self.proc_wave]:
+            if p.state() != QProcess.ProcessState.NotRunning:
+                p.kill()
+        e.accept()
+
+
+def main():
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
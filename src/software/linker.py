@@ -0,0 +1,195 @@
+"""
+linker.py
+Linker and object cache for separately assembled 8-But MightyController modules.
+
+Each module is assembled once into a relocatable object (assembler.py
+`assemble -c`): text as if it started at $00, data as if it started at $80,
+plus its symbols and a relocation for every byte that depends on where a
+label ends up. The linker places the modules' text one after another from
+$00 (the first module holds the reset entry point) and their data from $80,
+resolves .extern symbols against the other modules' .global ones and patches
+DIR address bytes, DB label bytes and REL branch offsets.
+
+Objects are cached by content: the key hashes the module source, its name
+and the assembler itself, so a build re-assembles only the modules that
+changed (or all of them after an assembler change).
+
+Usage
+─────
+$ python linker.py link Programs/build/app.bin main.asm lib/math.asm lib/io.asm --map
+$ python linker.py link app.bin main.obj lib.obj
+$ python linker.py cache --clear
+"""
+from __future__ import annotations
+
+import hashlib, pathlib, shutil, sys
+from typing import Dict, List, Tuple
+
+import click
+
+import assembler
+from assembler import (RAM_BASE, RAM_END, AsmError, ObjectFile, Program, assemble_object,
+                       read_object, write_object, write_program)
+
+ROM_SIZE  = RAM_BASE                      # ROM is $00-$7F
+CACHE_DIR = pathlib.Path("Programs/build/.objcache")
+
+class LinkError(RuntimeError):
+    pass
+
+# 1.  Link
+def layout(objects: List[ObjectFile]) -> List[Tuple[int, int]]:
+    """(text base, data base) of each module, in link order."""
+    bases, pc, dpc = [], 0, RAM_BASE
+    for obj in objects:
+        bases.append((pc, dpc))
+        pc, dpc = pc + len(obj.text), dpc + len(obj.data)
+    if pc > ROM_SIZE:
+        raise LinkError(f"text is {pc} bytes, the ROM holds {ROM_SIZE}")
+    if dpc > RAM_END:
+        raise LinkError(f"data runs to ${dpc:02X}, past the end of RAM (${RAM_END - 1:02X})")
+    return bases
+
+def link(objects: List[ObjectFile]) -> Program:
+    """Place `objects` in order and apply their relocations."""
+    if not objects:
+        raise LinkError("nothing to link")
+    bases = layout(objects)
+
+    def address(i: int, sym: str) -> int:
+        sec, off = objects[i].symbols[sym]
+        return off + {"text": bases[i][0], "data": bases[i][1], "abs": 0}[sec]
+
+    exported: Dict[str, int] = {}
+    for i, obj in enumerate(objects):
+        for sym in obj.globals:
+            if sym in exported:
+                raise LinkError(f"'{sym}' is exported by both {objects[exported[sym]].name} and {obj.name}")
+            exported[sym] = i
+
+    def resolve(i: int, sym: str) -> int:
+        if sym in objects[i].symbols:
+            return address(i, sym)
+        if sym in exported:
+            return address(exported[sym], sym)
+        raise LinkError(f"{objects[i].name}: undefined symbol '{sym}'")
+
+    rom = bytearray(b"".join(obj.text for obj in objects))
+    ram = bytearray(b"".join(obj.data for obj in objects))
+    for i, obj in enumerate(objects):
+        for sym in obj.externs:
+            resolve(i, sym)                              # unresolved externs fail even if unused
+        for r in obj.relocs:
+            value = resolve(i, r.symbol)
+            buf, pos = (rom, bases[i][0] + r.offset) if r.section == "text" else \
+                       (ram, bases[i][1] - RAM_BASE + r.offset)
+            if r.kind == "ABS":
+                buf[pos] = value & 0xFF
+            else:                                        # offset byte follows the opcode
+                offset = value - (pos - 1 + 3)
+                if not -128 <= offset <= 127:
+                    raise LinkError(f"{obj.name}: branch to '{r.symbol}' is out of range ({offset})")
+                buf[pos] = offset & 0xFF
+
+    # Exported symbols keep their names; module-local ones are qualified with the module name
+    symbols = {sym: address(i, sym) for sym, i in exported.items()}
+    for i, obj in enumerate(objects):
+        symbols.update({f"{obj.name}.{sym}": address(i, sym) for sym in obj.symbols if sym not in obj.globals})
+    return Program(bytes(rom), symbols, bytes(ram))
+
+# 2.  Object cache
+def assembler_fingerprint() -> str:
+    return hashlib.sha256(pathlib.Path(assembler.__file__).read_bytes()).hexdigest()
+
+class ObjectCache:
+    """Assembled objects keyed by SHA-256 of (assembler, module name, source)."""
+
+    def __init__(self, root: pathlib.Path = CACHE_DIR):
+        self.root = root
+        self.fingerprint = assembler_fingerprint()
+
+    def key(self, name: str, source: bytes) -> str:
+        h = hashlib.sha256(self.fingerprint.encode())
+        h.update(name.encode() + b"\0")
+        h.update(source)
+        return h.hexdigest()
+
+    def assemble(self, path: str | pathlib.Path) -> Tuple[ObjectFile, bool]:
+        """Object for the module at `path` and whether it came from the cache."""
+        path = pathlib.Path(path)
+        source = path.read_bytes()
+        entry = self.root / f"{self.key(path.stem, source)}.obj"
+        if entry.exists():
+            return read_object(entry), True
+        obj = assemble_object(source.decode("utf-8").splitlines(), path.stem)
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_object(entry, obj)
+        return obj, False
+
+    def stats(self) -> Tuple[int, int]:
+        files = list(self.root.glob("*.obj")) if self.root.exists() else []
+        return len(files), sum(f.stat().st_size for f in files)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+def load_modules(paths: List[str], cache: ObjectCache | None) -> Tuple[List[ObjectFile], int]:
+    """Objects for .asm sources (assembled, or taken from `cache`) and .obj files; returns (objects, assembled)."""
+    objects, assembled = [], 0
+    for path in paths:
+        if path.lower().endswith(".obj"):
+            objects.append(read_object(path))
+            continue
+        if cache is not None:
+            obj, hit = cache.assemble(path)
+        else:
+            obj, hit = assemble_object(pathlib.Path(path).read_text(encoding="utf-8").splitlines(),
+                                       pathlib.Path(path).stem), False
+        objects.append(obj)
+        assembled += not hit
+    return objects, assembled
+
+# 3.  CLI
+@click.group()
+def cli():
+    """Link separately assembled modules into a ROM image."""
+
+@cli.command("link")
+@click.argument("out_path", type=click.Path(dir_okay=False))
+@click.argument("modules", nargs=-1, required=True, type=click.Path(dir_okay=False, exists=True))
+@click.option("--map", "show_map", is_flag=True, help="Print where each module was placed")
+@click.option("--no-cache", is_flag=True, help="Re-assemble every .asm module")
+def link_cmd(out_path: str, modules: tuple, show_map: bool, no_cache: bool):
+    """Assemble (cached) and link MODULES (.asm or .obj, entry module first) into OUT_PATH."""
+    try:
+        objects, assembled = load_modules(list(modules), None if no_cache else ObjectCache())
+        prog = link(objects)
+    except AsmError as e:
+        click.echo(f"Assembler error: {e}", err=True)
+        sys.exit(1)
+    except LinkError as e:
+        click.echo(f"Linker error: {e}", err=True)
+        sys.exit(1)
+    pathlib.Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    write_program(out_path, prog)
+    if show_map:
+        for obj, (text, data) in zip(objects, layout(objects)):
+            click.echo(f"  {obj.name:<24} text ${text:02X}-${text + max(len(obj.text), 1) - 1:02X}"
+                       + (f"  data ${data:02X}-${data + len(obj.data) - 1:02X}" if obj.data else ""))
+    click.echo(f"[linker] {len(objects)} modules ({assembled} assembled) -> {len(prog.rom)} bytes"
+               + (f", {len(prog.ram)} RAM-init bytes" if prog.ram else "") + f" -> {out_path}")
+
+@cli.command("cache")
+@click.option("--clear", is_flag=True, help="Delete every cached object")
+def cache_cmd(clear: bool):
+    """Show (or clear) the object cache."""
+    cache = ObjectCache()
+    if clear:
+        cache.clear()
+        click.echo(f"[linker] cleared {cache.root}")
+        return
+    n, size = cache.stats()
+    click.echo(f"[linker] {n} objects, {size / 1024:.1f} KiB in {cache.root}")
+
+if __name__ == "__main__":
+    cli()
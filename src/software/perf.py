@@ -0,0 +1,103 @@
+"""
+perf.py
+CPI report from the testbench's performance counters (+PERF).
+
+With +PERF the testbench counts, without any per-cycle printing, the cycles
+spent in each FSM state, instructions retired per opcode class, branch
+outcomes and RAM / port accesses, and prints them once at the end as
+`PERF <group> [<name>] <count>` lines. This module turns those lines into a
+CPI breakdown: how many cycles per instruction each FSM state contributes.
+
+Usage
+─────
+$ python MightyController.py run test2(ALU) --perf
+$ python perf.py report sim.log
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+import click
+
+STATES  = ["FETCH", "DECODE", "EXECUTE", "LOADSTORE", "DATA", "BRANCH"]
+CLASSES = ["LOADSTORE", "ALU", "INCDEC", "BRANCH", "OTHER"]
+BAR_WIDTH = 30
+
+class PerfError(ValueError):
+    pass
+
+@dataclass
+class PerfCounters:
+    cycles:  int = 0
+    retired: int = 0
+    groups:  Dict[str, Dict[str, int]] = field(default_factory=dict)   # state / class / branch / access
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.retired if self.retired else 0.0
+
+    def get(self, group: str, name: str) -> int:
+        return self.groups.get(group, {}).get(name, 0)
+
+def parse_perf(lines: Iterable[str]) -> PerfCounters:
+    """Collect the PERF lines of one run's console output."""
+    perf, seen = PerfCounters(), False
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0] != "PERF":
+            continue
+        seen = True
+        if len(parts) == 3 and parts[1] in ("cycles", "retired"):
+            setattr(perf, parts[1], int(parts[2]))
+        elif len(parts) == 4:
+            perf.groups.setdefault(parts[1], {})[parts[2]] = int(parts[3])
+    if not seen:
+        raise PerfError("no PERF counters in the output (run with +PERF / --perf)")
+    return perf
+
+def _bar(part: int, whole: int) -> str:
+    return "█" * round(BAR_WIDTH * part / whole) if whole else ""
+
+def format_report(perf: PerfCounters) -> List[str]:
+    lines = [f"Cycles {perf.cycles}   instructions retired {perf.retired}   CPI {perf.cpi:.2f}", "",
+             f"{'state':<10} {'cycles':>8} {'share':>6} {'CPI':>6}"]
+    for state in STATES:
+        n = perf.get("state", state)
+        share = 100 * n / perf.cycles if perf.cycles else 0
+        lines.append(f"{state:<10} {n:>8} {share:>5.1f}% {n / perf.retired if perf.retired else 0:>6.2f}  "
+                     f"{_bar(n, perf.cycles)}")
+
+    lines += ["", f"{'class':<10} {'retired':>8} {'mix':>6}"]
+    for cls in CLASSES:
+        n = perf.get("class", cls)
+        lines.append(f"{cls:<10} {n:>8} {100 * n / perf.retired if perf.retired else 0:>5.1f}%")
+
+    taken, not_taken = perf.get("branch", "taken"), perf.get("branch", "not_taken")
+    lines += ["", f"Branches: {taken} taken, {not_taken} not taken"
+                  + (f" ({100 * taken / (taken + not_taken):.0f}% taken)" if taken + not_taken else "")]
+    lines.append("Data cycles: RAM {} read / {} write, ports {} read / {} write".format(
+        perf.get("access", "ram_read"), perf.get("access", "ram_write"),
+        perf.get("access", "port_read"), perf.get("access", "port_write")))
+    return lines
+
+@click.group()
+def cli():
+    """Performance counter reports."""
+
+@cli.command("report")
+@click.argument("log_path", type=click.Path(dir_okay=False, exists=True))
+def report_cmd(log_path: str):
+    """Print the CPI breakdown from a saved simulation log."""
+    try:
+        with open(log_path, encoding="utf-8", errors="ignore") as f:
+            perf = parse_perf(f)
+    except PerfError as e:
+        click.echo(f"Perf error: {e}", err=True)
+        sys.exit(1)
+    for line in format_report(perf):
+        click.echo(line)
+
+if __name__ == "__main__":
+    cli()
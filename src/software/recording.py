@@ -0,0 +1,173 @@
+"""
+recording.py
+Reader for recorded simulation runs of the 8-But MightyController.
+
+Record format
+─────────────
+With +RECORD=<file> the testbench writes one line per cycle:
+• @K cycle pc ir nzvc state <regs> <ram> <ports>   full snapshot every
+  +CHECKPOINT=N cycles (and once more at the end of the run)
+• @C cycle pc ir nzvc state                        any other cycle, followed by
+• @R idx val / @M addr val / @P port val           one line per changed register,
+                                                   RAM byte (0x80-0xDF) or output port
+
+Any cycle is rebuilt from the nearest checkpoint at or before it plus the
+deltas in between, so stepping backwards or jumping around never re-simulates.
+
+Usage
+─────
+$ python recording.py show Programs/build/prog.rec --cycle 30000
+"""
+from __future__ import annotations
+
+import bisect, pathlib, sys
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
+
+import click
+
+STATE_NAMES = ["Fetch", "Decode", "Execute", "LoadStore", "Data", "Branch"]
+REG_NAMES   = "ABCDEFGHIJKLMNOP"
+RAM_BASE    = 0x80
+RAM_SIZE    = 96
+PORT_BASE   = 0xF0
+PORT_COUNT  = 16
+
+class RecordError(RuntimeError):
+    pass
+
+# 1.  Machine state
+@dataclass
+class MachineState:
+    cycle: int = 0
+    pc:    int = 0
+    ir:    int = 0
+    nzvc:  int = 0
+    state: int = 0
+    regs:  bytearray = field(default_factory=lambda: bytearray(16))
+    ram:   bytearray = field(default_factory=lambda: bytearray(RAM_SIZE))
+    ports: bytearray = field(default_factory=lambda: bytearray(PORT_COUNT))
+
+    def copy(self) -> "MachineState":
+        return MachineState(self.cycle, self.pc, self.ir, self.nzvc, self.state,
+                            bytearray(self.regs), bytearray(self.ram), bytearray(self.ports))
+
+    def apply(self, line: str) -> bool:
+        """Apply one record line in place. Returns False for non-record lines."""
+        if not line.startswith("@"):
+            return False
+        f = line.split()
+        tag = f[0]
+        if tag in ("@K", "@C"):
+            self.cycle = int(f[1])
+            self.pc, self.ir, self.nzvc = int(f[2], 16), int(f[3], 16), int(f[4], 16)
+            self.state = int(f[5])
+            if tag == "@K":
+                self.regs  = bytearray.fromhex(f[6])
+                self.ram   = bytearray.fromhex(f[7])
+                self.ports = bytearray.fromhex(f[8])
+        elif tag == "@R":
+            self.regs[int(f[1])] = int(f[2], 16)
+        elif tag == "@M":
+            self.ram[int(f[1], 16) - RAM_BASE] = int(f[2], 16)
+        elif tag == "@P":
+            self.ports[int(f[1])] = int(f[2], 16)
+        else:
+            return False
+        return True
+
+    @property
+    def flags(self) -> str:
+        return "".join(ch if self.nzvc & bit else "-" for ch, bit in zip("NZVC", (8, 4, 2, 1)))
+
+    @property
+    def state_name(self) -> str:
+        return STATE_NAMES[self.state] if self.state < len(STATE_NAMES) else "UNKNOWN"
+
+def format_state(st: MachineState) -> str:
+    """Human-readable dump of a machine state (registers, RAM, ports)."""
+    out = [f"Cycle {st.cycle}: PC=0x{st.pc:02X} IR=0x{st.ir:02X} "
+           f"Flags={st.flags} State={st.state_name}"]
+    for half in (0, 8):
+        out.append("  " + " ".join(f"{REG_NAMES[i]}={st.regs[i]:02X}" for i in range(half, half + 8)))
+    for row in range(0, RAM_SIZE, 16):
+        out.append(f"  ${RAM_BASE + row:02X}: " + st.ram[row:row + 16].hex(" ").upper())
+    out.append(f"  ${PORT_BASE:02X}: " + st.ports.hex(" ").upper())
+    return "\n".join(out)
+
+# 2.  Recording
+class Recording:
+    """Checkpoints plus per-cycle deltas of one recorded run."""
+
+    def __init__(self, lines: Iterable[str]):
+        self.checkpoints: List[MachineState] = []
+        # (cycle, header line, delta lines) for every non-checkpoint cycle
+        self._deltas: List[Tuple[int, str, List[str]]] = []
+
+        current: List[str] | None = None
+        for ln in lines:
+            ln = ln.strip()
+            if ln.startswith("@K"):
+                st = MachineState()
+                st.apply(ln)
+                self.checkpoints.append(st)
+                current = None
+            elif ln.startswith("@C"):
+                current = []
+                self._deltas.append((int(ln.split()[1]), ln, current))
+            elif ln.startswith("@") and current is not None:
+                current.append(ln)
+
+        if not self.checkpoints:
+            raise RecordError("recording contains no checkpoint")
+        self._cp_cycles    = [cp.cycle for cp in self.checkpoints]
+        self._delta_cycles = [d[0] for d in self._deltas]
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "Recording":
+        with open(path, encoding="ascii") as fh:
+            return cls(fh)
+
+    @property
+    def first_cycle(self) -> int:
+        return self.checkpoints[0].cycle
+
+    @property
+    def last_cycle(self) -> int:
+        return max(self._cp_cycles[-1], self._delta_cycles[-1] if self._deltas else 0)
+
+    def state_at(self, cycle: int) -> MachineState:
+        """Reconstruct the state at the end of `cycle` from the nearest checkpoint."""
+        cycle = min(max(cycle, self.first_cycle), self.last_cycle)
+        cp = self.checkpoints[bisect.bisect_right(self._cp_cycles, cycle) - 1]
+        st = cp.copy()
+        lo = bisect.bisect_right(self._delta_cycles, cp.cycle)
+        hi = bisect.bisect_right(self._delta_cycles, cycle)
+        for _, header, lines in self._deltas[lo:hi]:
+            st.apply(header)
+            for ln in lines:
+                st.apply(ln)
+        return st
+
+# 3.  CLI
+@click.group()
+def cli():
+    """Recorded-run inspection for the 8-But MightyController."""
+
+@cli.command("show")
+@click.argument("rec_path", type=click.Path(dir_okay=False, exists=True))
+@click.option("--cycle", "-c", type=int, default=None,
+              help="Cycle to reconstruct (defaults to the last recorded cycle)")
+def show_cmd(rec_path: str, cycle: int | None):
+    """Print the machine state of REC_PATH at a given cycle."""
+    try:
+        rec = Recording.load(rec_path)
+    except RecordError as e:
+        click.echo(f"Record error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"[recording] cycles {rec.first_cycle}..{rec.last_cycle}, "
+               f"{len(rec.checkpoints)} checkpoints")
+    click.echo(format_state(rec.state_at(rec.last_cycle if cycle is None else cycle)))
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,187 @@
+"""
+simcache.py
+Persistent result cache for 8-But MightyController simulations.
+
+A run is identified by
+• the SHA-256 of the ROM image passed with +ROMFILE (and +RAMFILE, if any),
+• a fingerprint of every source in src/verilog plus computer_TB.v,
+• the exact vvp argument list.
+A hit replays the stored console output (including any state-stream lines),
+hands back the run's final machine state (the last @K snapshot of the state
+stream or the +RECORD file), restores the +RECORD and +COVERAGE files and
+points at the cached waves.vcd, without starting vvp. Only a waves.vcd the run
+itself wrote is kept: Verilator runs dump no waves and store none. Entries are
+evicted least-recently-used first once the cache grows past its size budget.
+
+Usage
+─────
+$ python simcache.py stats
+$ python simcache.py clear
+"""
+from __future__ import annotations
+
+import hashlib, json, pathlib, shutil, time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import click
+
+CACHE_DIR         = pathlib.Path("Programs/build/.simcache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+WAVE_FILE         = pathlib.Path("waves.vcd")
+# output files named by plusargs, kept with each entry: plusarg -> file in the entry
+ARTIFACTS         = {"RECORD": "record.rec", "COVERAGE": "coverage.cov"}
+
+# 1.  Keys
+def rtl_fingerprint(sources: List[str]) -> str:
+    """Hash of the RTL and testbench sources (names and contents)."""
+    h = hashlib.sha256()
+    for path in sorted(map(pathlib.Path, sources)):
+        h.update(path.as_posix().encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+def _plusarg(sim_args: List[str], name: str) -> Optional[str]:
+    prefix = f"+{name}="
+    for arg in sim_args:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return None
+
+def wave_stamp() -> Optional[int]:
+    """Modification time of waves.vcd (None if absent); taken before a run to see whether it dumped waves."""
+    return WAVE_FILE.stat().st_mtime_ns if WAVE_FILE.exists() else None
+
+def _last_checkpoint(path: pathlib.Path) -> Optional[str]:
+    """Closing @K line of a recording (the last line of the file)."""
+    with open(path, "rb") as fh:
+        fh.seek(max(0, fh.seek(0, 2) - 4096))
+        lines = [ln for ln in fh.read().decode("ascii", errors="ignore").splitlines() if ln.startswith("@K")]
+    return lines[-1] if lines else None
+
+def cache_key(sim_args: List[str], sources: List[str]) -> str:
+    """Key for one run: ROM/RAM image hashes, source fingerprint and the vvp arguments."""
+    h = hashlib.sha256()
+    for image in ("ROMFILE", "RAMFILE"):
+        path = _plusarg(sim_args, image)
+        h.update(hashlib.sha256(pathlib.Path(path).read_bytes()).digest() if path else b"")
+    h.update(rtl_fingerprint(sources).encode())
+    h.update(json.dumps(sim_args).encode())
+    return h.hexdigest()
+
+# 2.  Entries
+@dataclass
+class CacheEntry:
+    path: pathlib.Path
+    exit_code: int
+    sim_args: List[str]
+
+    @property
+    def output(self) -> str:
+        return (self.path / "console.txt").read_text(encoding="utf-8")
+
+    @property
+    def wave_file(self) -> Optional[pathlib.Path]:
+        p = self.path / "waves.vcd"
+        return p if p.exists() else None
+
+    @property
+    def final_state(self) -> Optional[str]:
+        """Last full-state (@K) line of the run, if it produced one."""
+        p = self.path / "state.txt"
+        return p.read_text(encoding="ascii").strip() if p.exists() else None
+
+    def restore_outputs(self):
+        """Put the cached +RECORD / +COVERAGE files back where the run asked for them."""
+        for plusarg, name in ARTIFACTS.items():
+            target = _plusarg(self.sim_args, plusarg)
+            if target and (self.path / name).exists():
+                shutil.copyfile(self.path / name, target)
+
+class SimCache:
+    def __init__(self, root: pathlib.Path = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = pathlib.Path(root)
+        self.max_bytes = max_bytes
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        meta = self.root / key / "meta.json"
+        if not meta.exists():
+            return None
+        info = json.loads(meta.read_text(encoding="utf-8"))
+        meta.touch()                                # mark as most recently used
+        return CacheEntry(meta.parent, info["exit_code"], info["sim_args"])
+
+    def store(self, key: str, sim_args: List[str], output: str, exit_code: int,
+              waves_before: Optional[int]) -> CacheEntry:
+        """Save a finished run, picking up the +RECORD / +COVERAGE files if present and waves.vcd
+        if it changed since `waves_before` (its wave_stamp() from before the run)."""
+        entry = self.root / key
+        tmp = self.root / f"{key}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        (tmp / "console.txt").write_text(output, encoding="utf-8")
+        final = [ln for ln in output.splitlines() if ln.startswith("@K")]
+        record = _plusarg(sim_args, "RECORD")
+        state = final[-1] if final else \
+                _last_checkpoint(pathlib.Path(record)) if record and pathlib.Path(record).exists() else None
+        if state:
+            (tmp / "state.txt").write_text(state + "\n", encoding="ascii")
+        if WAVE_FILE.exists() and wave_stamp() != waves_before:
+            shutil.copyfile(WAVE_FILE, tmp / "waves.vcd")
+        for plusarg, name in ARTIFACTS.items():
+            produced = _plusarg(sim_args, plusarg)
+            if produced and pathlib.Path(produced).exists():
+                shutil.copyfile(produced, tmp / name)
+        (tmp / "meta.json").write_text(json.dumps(
+            {"sim_args": sim_args, "exit_code": exit_code, "created": time.time()}), encoding="utf-8")
+
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+        self.evict()
+        return CacheEntry(entry, exit_code, sim_args)
+
+    def _entries(self) -> List[tuple]:
+        """(last_used, size, path) for every complete entry."""
+        out = []
+        if self.root.exists():
+            for d in self.root.iterdir():
+                meta = d / "meta.json"
+                if d.is_dir() and meta.exists():
+                    size = sum(f.stat().st_size for f in d.iterdir())
+                    out.append((meta.stat().st_mtime, size, d))
+        return out
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, d in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+# 3.  CLI
+@click.group()
+def cli():
+    """Simulation result cache maintenance."""
+
+@cli.command("stats")
+def stats_cmd():
+    """Show the number of cached runs and their total size."""
+    entries = SimCache()._entries()
+    total = sum(size for _, size, _ in entries)
+    click.echo(f"[simcache] {len(entries)} entries, {total / 1024:.1f} KiB in {CACHE_DIR}")
+
+@cli.command("clear")
+def clear_cmd():
+    """Delete every cached run."""
+    SimCache().clear()
+    click.echo(f"[simcache] cleared {CACHE_DIR}")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,383 @@
+"""
+simulator.py
+GUI-independent assemble / compile / simulate orchestration for the
+8-But MightyController. The Qt front-end (gui.py) drives the same functions.
+
+Nothing in here imports PyQt6, so scripted and CI runs start quickly and
+work on machines without a display. Paths are relative to the repository
+root, like the rest of the tooling.
+
+Usage
+─────
+$ python MightyController.py run "Programs/asm/test1(LD).asm" --cycles 500
+$ python MightyController.py run test2(ALU) --debug pc --debug state
+$ python MightyController.py programs
+$ python MightyController.py bench test2(ALU) --cycles 200000
+$ python MightyController.py run test3(INC_DEC) --prefetch --perf
+$ python MightyController.py bench test2(ALU) --no-fast      # full (debug) testbench build
+
+Runs without debug output or trace triggers use the fast testbench build
+(-DFAST, tb_fast.out), which has the per-cycle debug logic compiled out.
+"""
+from __future__ import annotations
+
+import pathlib, re, subprocess, sys, time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import click
+
+from backends import BACKENDS, DEFAULT_BACKEND, SimBackend, available_backends, get_backend
+from assembler import AsmError, assemble_program, ram_image_path, read_symbols, write_program
+from simcache import CacheEntry, SimCache, cache_key, wave_stamp
+from recording import MachineState, format_state
+from triggers import TriggerError, trigger_plusargs
+from perf import PerfError, format_report, parse_perf
+
+BUILD_DIR = pathlib.Path("Programs/build")
+
+# (option attribute, plusarg, label) for the per-cycle debug switches
+DEBUG_FLAGS = [
+    ("pc",    "+DEBUG_PC",    "PC"),
+    ("ir",    "+DEBUG_IR",    "IR"),
+    ("regs",  "+DEBUG_REGS",  "Registers"),
+    ("mem",   "+DEBUG_MEM",   "Memory"),
+    ("inner", "+DEBUG_INNER", "Inner Workings"),
+    ("state", "+DEBUG_STATE", "State"),
+]
+
+class SimError(RuntimeError):
+    pass
+
+# 1.  Options
+@dataclass
+class SimOptions:
+    cycles:       int  = 1000
+    debug:        bool = False      # master switch, like "Enable Debug" in the GUI
+    pc:           bool = False
+    ir:           bool = False
+    regs:         bool = False
+    mem:          bool = False
+    inner:        bool = False
+    state:        bool = False
+    verbose:      bool = False
+    record:       Optional[str] = None
+    checkpoint:   int  = 1000
+    state_stream: bool = False
+    trace_start:  List[str] = field(default_factory=list)   # trigger specs, see triggers.py
+    trace_stop:   List[str] = field(default_factory=list)
+    coverage:     Optional[str] = None      # coverage database path, see coverage.py
+    perf:         bool = False              # performance counters, see perf.py
+    prefetch:     bool = False              # compile-time: overlapped instruction fetch
+    fast:         bool = True               # compile-time: stripped testbench when nothing needs debug logic
+
+    @property
+    def fast_build(self) -> bool:
+        """True when the run can use the FAST testbench build (no debug output, no trace triggers)."""
+        return self.fast and not (self.debug or self.verbose or self.trace_start or self.trace_stop)
+
+    @property
+    def defines(self) -> List[str]:
+        """`define macros of the testbench image these options need."""
+        return (["PREFETCH"] if self.prefetch else []) + (["FAST"] if self.fast_build else [])
+
+    @property
+    def active_debug(self) -> List[str]:
+        """Labels of the enabled debug switches (empty when debugging is off)."""
+        if not self.debug:
+            return []
+        active = [label for attr, _, label in DEBUG_FLAGS if getattr(self, attr)]
+        if self.verbose:
+            active.append("Verbose")
+        return active
+
+# 2.  Programs
+def bin_path(program_name: str) -> pathlib.Path:
+    return BUILD_DIR / f"{program_name}.bin"
+
+def sym_path(program_name: str) -> pathlib.Path:
+    return BUILD_DIR / f"{program_name}.sym"
+
+def discover_programs(build_dir: pathlib.Path = BUILD_DIR) -> List[str]:
+    """Names of the assembled programs available for a quick run."""
+    build_dir.mkdir(parents=True, exist_ok=True)
+    return sorted(p.stem for p in build_dir.glob("*.bin") if not p.name.endswith(".ram.bin"))
+
+def assemble_file(asm_path: str | pathlib.Path, out: str | pathlib.Path | None = None) -> pathlib.Path:
+    """Assemble an .asm file into Programs/build (or `out`) and return the image path."""
+    asm_path = pathlib.Path(asm_path)
+    out = pathlib.Path(out) if out else bin_path(asm_path.stem)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    prog = assemble_program(asm_path.read_text(encoding="utf-8").splitlines())
+    write_program(out, prog)
+    return out
+
+# 3.  Compile & simulate
+def build_simulation_args(program_name: str, testbench_file: pathlib.Path,
+                          opts: SimOptions) -> List[str]:
+    """vvp argument list (image first, then plusargs) for one simulation run."""
+    sim_args = [
+        str(testbench_file),
+        f"+ROMFILE={bin_path(program_name).as_posix()}",
+        f"+TESTNAME={program_name} Test",
+        f"+CYCLES={opts.cycles}"
+    ]
+
+    ram_image = ram_image_path(bin_path(program_name))
+    if ram_image.exists():
+        sim_args.append(f"+RAMFILE={ram_image.as_posix()}")
+
+    if opts.debug:
+        sim_args.append("+DEBUG")
+        sim_args.extend(flag for attr, flag, _ in DEBUG_FLAGS if getattr(opts, attr))
+
+    if opts.verbose:
+        sim_args.append("+DEBUG_VERBOSE")
+
+    if opts.state_stream:
+        sim_args.append("+STATE_STREAM")
+
+    if opts.record:
+        sim_args.append(f"+RECORD={opts.record}")
+        sim_args.append(f"+CHECKPOINT={opts.checkpoint}")
+
+    if opts.coverage:
+        sim_args.append(f"+COVERAGE={opts.coverage}")
+
+    if opts.perf:
+        sim_args.append("+PERF")
+
+    if opts.trace_start or opts.trace_stop:
+        syms = sym_path(program_name)
+        symbols = read_symbols(syms) if syms.exists() else {}
+        sim_args.extend(trigger_plusargs(opts.trace_start, opts.trace_stop, symbols))
+
+    return sim_args
+
+def _stream(cmd: List[str], on_line: Callable[[str], None]) -> int:
+    """Run `cmd`, handing each line of merged stdout/stderr to `on_line`."""
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, errors="ignore")
+    except FileNotFoundError:
+        raise SimError(f"'{cmd[0]}' not found on PATH")
+    with proc:
+        for line in proc.stdout:
+            on_line(line.rstrip("\n"))
+    return proc.returncode
+
+def compile_testbench(backend: SimBackend | None = None, on_line: Callable[[str], None] = print,
+                      defines: List[str] = (), force: bool = False) -> pathlib.Path:
+    """Build the testbench image for `backend` (default: icarus) and return its path.
+
+    An image newer than every source is reused unless `force` is set.
+    """
+    backend = backend or get_backend()
+    image = backend.image_for(defines)
+    if not force and not backend.needs_build(defines):
+        return image
+    image.parent.mkdir(parents=True, exist_ok=True)
+    if _stream(backend.compile_command(defines), on_line) != 0:
+        raise SimError(f"testbench compilation failed ({backend.name})")
+    image.touch()                       # verilator leaves an unchanged executable's mtime alone
+    return image
+
+def lookup_cached(sim_args: List[str], cache: SimCache, backend: SimBackend) -> Optional[CacheEntry]:
+    return cache.lookup(cache_key(sim_args, backend.sources()))
+
+def replay(entry: CacheEntry, on_line: Callable[[str], None] = print) -> int:
+    """Feed a cached run back through `on_line` as if vvp had just produced it."""
+    entry.restore_outputs()
+    for line in entry.output.splitlines():
+        on_line(line)
+    return entry.exit_code
+
+def run_simulation(sim_args: List[str], on_line: Callable[[str], None] = print,
+                   cache: Optional[SimCache] = None, backend: SimBackend | None = None) -> int:
+    """Run the testbench with `sim_args`, streaming its output. Returns the exit code.
+
+    With a cache, an identical earlier run is replayed instead and a fresh
+    successful run is stored for next time.
+    """
+    backend = backend or get_backend()
+    cmd = backend.run_command(sim_args)
+    if cache is None:
+        return _stream(cmd, on_line)
+
+    key = cache_key(sim_args, backend.sources())
+    entry = cache.lookup(key)
+    if entry is not None:
+        return replay(entry, on_line)
+
+    lines: List[str] = []
+    def tee(line: str):
+        lines.append(line)
+        on_line(line)
+    waves_before = wave_stamp()
+    code = _stream(cmd, tee)
+    if code == 0:
+        cache.store(key, sim_args, "\n".join(lines) + "\n", code, waves_before)
+    return code
+
+_CYCLES_RE = re.compile(r"Execution time: (\d+) cycles|TIMEOUT after (\d+) cycles")
+
+def measure_speed(sim_args: List[str], backend: SimBackend) -> tuple:
+    """Run once without cache; return (simulated cycles, wall seconds)."""
+    cycles = 0
+    def scan(line: str):
+        nonlocal cycles
+        if (m := _CYCLES_RE.search(line)):
+            cycles = int(m.group(1) or m.group(2))
+    t0 = time.perf_counter()
+    if _stream(backend.run_command(sim_args), scan) != 0:
+        raise SimError(f"simulation failed ({backend.name})")
+    return cycles, time.perf_counter() - t0
+
+# 4.  CLI
+@click.group()
+def cli():
+    """8-bit CPU utility suite – headless assemble / compile / simulate."""
+
+@cli.command("programs")
+def programs_cmd():
+    """List the assembled programs in Programs/build."""
+    for name in discover_programs():
+        click.echo(name)
+
+@cli.command("compile")
+@click.option("--backend", "-b", type=click.Choice(list(BACKENDS)), default=DEFAULT_BACKEND,
+              show_default=True, help="Simulator back-end")
+@click.option("--prefetch", is_flag=True, help="Build the overlapped-fetch CPU variant")
+@click.option("--fast", is_flag=True, help="Build the stripped testbench (no debug logic)")
+def compile_cmd(backend: str, prefetch: bool, fast: bool):
+    """Compile the RTL and testbench into the back-end's testbench image."""
+    try:
+        out = compile_testbench(get_backend(backend), defines=SimOptions(prefetch=prefetch, fast=fast).defines,
+                                force=True)
+    except SimError as e:
+        click.echo(f"Simulation error: {e}", err=True)
+        sys.exit(1)
+    click.echo(f"[simulator] compiled -> {out}")
+
+@cli.command("run")
+@click.argument("program")
+@click.option("--cycles", "-n", default=1000, show_default=True, help="Maximum simulation cycles")
+@click.option("--debug", "-d", "debug", multiple=True,
+              type=click.Choice([attr for attr, _, _ in DEBUG_FLAGS]),
+              help="Enable a debug switch (repeatable)")
+@click.option("--verbose", is_flag=True, help="Turn every debug switch on")
+@click.option("--record", default=None, help="Record the run to this file")
+@click.option("--checkpoint", default=1000, show_default=True, help="Record checkpoint interval")
+@click.option("--coverage", default=None, help="Write a coverage database to this file")
+@click.option("--perf", is_flag=True, help="Count cycles per FSM state and print a CPI report")
+@click.option("--prefetch", is_flag=True, help="Simulate the overlapped-fetch CPU variant")
+@click.option("--no-fast", is_flag=True, help="Use the full testbench build even without debug output")
+@click.option("--trace-start", multiple=True, help="Open debug output on a trigger, e.g. pc:LOOP")
+@click.option("--trace-stop", multiple=True, help="Close debug output on a trigger, e.g. write:$F0")
+@click.option("--no-compile", is_flag=True, help="Reuse the existing testbench image")
+@click.option("--no-cache", is_flag=True, help="Always simulate, ignoring cached results")
+@click.option("--backend", "-b", type=click.Choice(list(BACKENDS)), default=DEFAULT_BACKEND,
+              show_default=True, help="Simulator back-end")
+def run_cmd(program: str, cycles: int, debug: tuple, verbose: bool,
+            record: str | None, checkpoint: int, coverage: str | None, perf: bool, prefetch: bool,
+            no_fast: bool, trace_start: tuple, trace_stop: tuple, no_compile: bool, no_cache: bool,
+            backend: str):
+    """Simulate PROGRAM (a name in Programs/build or an .asm file to assemble first)."""
+    opts = SimOptions(cycles=cycles, debug=bool(debug) or verbose, verbose=verbose,
+                      record=record, checkpoint=checkpoint, coverage=coverage, perf=perf,
+                      prefetch=prefetch, fast=not no_fast,
+                      trace_start=list(trace_start), trace_stop=list(trace_stop),
+                      **{attr: True for attr in debug})
+    sim = get_backend(backend)
+    try:
+        program = resolve_program(program)
+        sim_args = build_simulation_args(program, sim.image_for(opts.defines), opts)
+        output: List[str] = []
+        def echo(line: str):
+            output.append(line)
+            print(line)
+        cache = None if no_cache else SimCache()
+        if cache is not None and (entry := lookup_cached(sim_args, cache, sim)) is not None:
+            click.echo(f"[simulator] cache hit: {entry.path}", err=True)
+            code = replay(entry, echo)
+            if entry.wave_file:
+                click.echo(f"[simulator] waveform: {entry.wave_file}", err=True)
+            if entry.final_state:
+                final = MachineState()
+                final.apply(entry.final_state)
+                click.echo(f"[simulator] final state:\n{format_state(final)}", err=True)
+        else:
+            if not no_compile:
+                compile_testbench(sim, defines=opts.defines)
+            code = run_simulation(sim_args, echo, cache=cache, backend=sim)
+        if perf:
+            click.echo("")
+            for line in format_report(parse_perf(output)):
+                click.echo(line)
+    except AsmError as e:
+        click.echo(f"Assembler error: {e}", err=True)
+        sys.exit(1)
+    except TriggerError as e:
+        click.echo(f"Trigger error: {e}", err=True)
+        sys.exit(1)
+    except PerfError as e:
+        click.echo(f"Perf error: {e}", err=True)
+        sys.exit(1)
+    except SimError as e:
+        click.echo(f"Simulation error: {e}", err=True)
+        sys.exit(1)
+    sys.exit(code)
+
+def resolve_program(program: str) -> str:
+    """Program name in Programs/build, assembling an .asm path first."""
+    if program.lower().endswith(".asm"):
+        out = assemble_file(program)
+        click.echo(f"[assembler] wrote {out.stat().st_size} bytes -> {out}")
+        program = out.stem
+    if not bin_path(program).exists():
+        raise SimError(f"binary file not found: {bin_path(program)}")
+    return program
+
+@cli.command("bench")
+@click.argument("program")
+@click.option("--cycles", "-n", default=100000, show_default=True, help="Maximum simulation cycles")
+@click.option("--backend", "-b", "names", multiple=True, type=click.Choice(list(BACKENDS)),
+              help="Back-end to measure (repeatable; default: every installed one)")
+@click.option("--prefetch", is_flag=True, help="Measure the overlapped-fetch CPU variant")
+@click.option("--no-fast", is_flag=True, help="Measure the full testbench build instead of the fast one")
+@click.option("--no-compile", is_flag=True, help="Reuse the existing testbench images")
+def bench_cmd(program: str, cycles: int, names: tuple, prefetch: bool, no_fast: bool, no_compile: bool):
+    """Compare simulated cycles per second across back-ends for PROGRAM."""
+    names = list(names) or available_backends()
+    if not names:
+        click.echo("Simulation error: no simulator back-end installed", err=True)
+        sys.exit(1)
+    try:
+        program = resolve_program(program)
+        opts = SimOptions(cycles=cycles, prefetch=prefetch, fast=not no_fast)
+        results = []
+        for name in names:
+            sim = get_backend(name)
+            if not sim.available():
+                click.echo(f"[bench] {name}: not installed, skipped")
+                continue
+            if not no_compile and sim.needs_build(opts.defines):
+                t0 = time.perf_counter()
+                compile_testbench(sim, on_line=lambda _: None, defines=opts.defines)
+                click.echo(f"[bench] {name}: compiled in {time.perf_counter() - t0:.2f} s")
+            sim_args = build_simulation_args(program, sim.image_for(opts.defines), opts)
+            results.append((name,) + measure_speed(sim_args, sim))
+    except (AsmError, SimError) as e:
+        click.echo(f"Simulation error: {e}", err=True)
+        sys.exit(1)
+    if not results:
+        sys.exit(1)
+
+    base = results[0][1] / results[0][2] if results[0][2] else 0
+    click.echo(f"{'backend':<10} {'cycles':>10} {'seconds':>9} {'cycles/s':>12} {'speed-up':>9}")
+    for name, n, secs in results:
+        rate = n / secs if secs else 0
+        click.echo(f"{name:<10} {n:>10} {secs:>9.3f} {rate:>12.0f} {rate / base if base else 0:>8.1f}x")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,240 @@
+"""
+tracediff.py
+First-divergence diff of two 8-But MightyController runs.
+
+Both runs are read as record streams (see recording.py): saved +RECORD files,
+or two live simulations started with +STATE_STREAM, whose stdout is consumed
+line by line as the simulator produces it (each in its own temporary directory,
+so the two never write the same waves.vcd). Each stream keeps one machine state
+that every record line updates in place, and the two states are compared at
+the end of every cycle on PC, IR, flags, FSM state, registers, RAM and output
+ports (memory writes show up as RAM / port changes). Only the last few cycles
+are kept for context, so memory use does not grow with the length of the runs;
+at the first divergence both simulators are stopped.
+
+Usage
+─────
+$ python tracediff.py diff old.rec new.rec --context 8
+$ python tracediff.py run "Programs/asm/test2(ALU).asm" -n 50000 --image-a old_tb_fast.out
+$ python tracediff.py run test3(INC_DEC) test3b --ignore state
+"""
+from __future__ import annotations
+
+import contextlib, pathlib, subprocess, sys, tempfile
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+import click
+
+from assembler import AsmError
+from backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from recording import PORT_BASE, RAM_BASE, REG_NAMES, MachineState
+from simulator import SimError, SimOptions, build_simulation_args, compile_testbench, resolve_program
+
+FIELDS = ["pc", "ir", "flags", "state", "regs", "ram", "ports"]
+STATE_ABBR = ["Fetch", "Decode", "Exec", "LdSt", "Data", "Branch"]
+
+# 1.  Cycle streams
+def cycle_stream(lines: Iterable[str]) -> Iterator[Tuple[MachineState, List[str]]]:
+    """(state, changes) at the end of each recorded cycle.
+
+    `state` is the same object every time, updated in place; `changes` holds
+    the cycle's @R / @M / @P lines. Non-record lines are skipped, and the
+    closing snapshot (which repeats the last cycle) is merged into that cycle.
+    """
+    st, changes, started = MachineState(), [], False
+    for ln in lines:
+        if not ln.startswith("@"):
+            continue
+        if ln.startswith(("@K", "@C")):
+            if started and int(ln.split(None, 2)[1]) != st.cycle:
+                yield st, changes
+                changes = []
+            started = True
+        else:
+            changes.append(ln.rstrip())
+        st.apply(ln)
+    if started:
+        yield st, changes
+
+def differences(a: MachineState, b: MachineState, fields: List[str]) -> List[str]:
+    """Human-readable list of the compared fields that differ ([] if none)."""
+    out = []
+    if "pc" in fields and a.pc != b.pc:
+        out.append(f"PC {a.pc:02X} / {b.pc:02X}")
+    if "ir" in fields and a.ir != b.ir:
+        out.append(f"IR {a.ir:02X} / {b.ir:02X}")
+    if "flags" in fields and a.nzvc != b.nzvc:
+        out.append(f"flags {a.flags} / {b.flags}")
+    if "state" in fields and a.state != b.state:
+        out.append(f"state {a.state_name} / {b.state_name}")
+    for name, base, va, vb in (("regs", None, a.regs, b.regs), ("ram", RAM_BASE, a.ram, b.ram),
+                               ("ports", PORT_BASE, a.ports, b.ports)):
+        if name in fields and va != vb:
+            out.extend(f"{REG_NAMES[i] if base is None else f'${base + i:02X}'} {x:02X} / {y:02X}"
+                       for i, (x, y) in enumerate(zip(va, vb)) if x != y)
+    return out
+
+def summary(st: MachineState, changes: List[str]) -> str:
+    """One-line view of a cycle: header fields plus what it changed."""
+    parts = []
+    for ln in changes:
+        tag, loc, val = ln.split()
+        parts.append(f"{REG_NAMES[int(loc)]}={val.upper()}" if tag == "@R" else
+                     f"${int(loc, 16):02X}={val.upper()}" if tag == "@M" else
+                     f"${PORT_BASE + int(loc):02X}={val.upper()}")
+    state = STATE_ABBR[st.state] if st.state < len(STATE_ABBR) else "?"
+    return f"{st.cycle:>7} PC={st.pc:02X} IR={st.ir:02X} {st.flags} {state:<6} {' '.join(parts)}".rstrip()
+
+# 2.  Diff
+@dataclass
+class Divergence:
+    cycle:     int
+    reasons:   List[str]                      # differing fields, or which run ended first
+    before:    List[Tuple[str, str]]          # context rows (run A, run B), oldest first
+    at:        Tuple[str, str]
+    after:     List[Tuple[str, str]] = field(default_factory=list)
+
+@dataclass
+class DiffResult:
+    cycles:     int                           # cycles compared
+    divergence: Optional[Divergence]
+
+def first_divergence(a: Iterable[str], b: Iterable[str], fields: List[str] = FIELDS,
+                     context: int = 5, after: int = 2) -> DiffResult:
+    """Compare two record streams cycle by cycle and stop at the first difference."""
+    sa_iter, sb_iter = cycle_stream(a), cycle_stream(b)
+    history: Deque[Tuple[str, str]] = deque(maxlen=context)
+    compared = 0
+    while True:
+        na, nb = next(sa_iter, None), next(sb_iter, None)
+        if na is None and nb is None:
+            return DiffResult(compared, None)
+        if na is None or nb is None:
+            ended, other = ("A", nb) if na is None else ("B", na)
+            row = ("(ended)", summary(*other)) if na is None else (summary(*other), "(ended)")
+            return DiffResult(compared, Divergence(other[0].cycle, [f"run {ended} ended first"],
+                                                   list(history), row))
+        (sa, ca), (sb, cb) = na, nb
+        reasons = differences(sa, sb, fields)
+        if sa.cycle != sb.cycle:
+            reasons.insert(0, f"cycle {sa.cycle} / {sb.cycle}")
+        row = (summary(sa, ca), summary(sb, cb))
+        if reasons:
+            cycle = sa.cycle                     # the states move on while the after-context is read
+            rest = [(summary(*x), summary(*y)) for x, y in islice(zip(sa_iter, sb_iter), after)]
+            return DiffResult(compared, Divergence(cycle, reasons, list(history), row, rest))
+        history.append(row)
+        compared += 1
+
+def format_divergence(div: Divergence) -> List[str]:
+    rows = div.before + [div.at] + div.after
+    width = max(len(ra) for ra, _ in rows)
+    lines = [f"{'run A':<{width}}   run B"]
+    for i, (ra, rb) in enumerate(rows):
+        mark = "≠" if i == len(div.before) else "│"
+        lines.append(f"{ra:<{width}} {mark} {rb}")
+    lines.append("")
+    lines.append(f"First divergence at cycle {div.cycle}: " + ", ".join(div.reasons))
+    return lines
+
+# 3.  Sources
+@contextlib.contextmanager
+def live_lines(cmd: List[str]) -> Iterator[Iterable[str]]:
+    """stdout lines of a simulation running in a temporary directory; the process is stopped on exit."""
+    tmp = tempfile.TemporaryDirectory(prefix="tracediff_")
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, errors="ignore", cwd=tmp.name)
+    except FileNotFoundError:
+        tmp.cleanup()
+        raise SimError(f"'{cmd[0]}' not found on PATH")
+    try:
+        yield proc.stdout
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+        tmp.cleanup()
+
+def _absolute_args(sim_args: List[str]) -> List[str]:
+    """`sim_args` with the image and the ROM / RAM files as absolute paths, for another cwd."""
+    out = [str(pathlib.Path(sim_args[0]).resolve())]
+    for arg in sim_args[1:]:
+        key, _, value = arg.partition("=")
+        out.append(f"{key}={pathlib.Path(value).resolve().as_posix()}"
+                   if key in ("+ROMFILE", "+RAMFILE") else arg)
+    return out
+
+def _report(result: DiffResult):
+    if result.divergence is None:
+        click.echo(f"[tracediff] {result.cycles} cycles compared, no divergence")
+        sys.exit(0)
+    for line in format_divergence(result.divergence):
+        click.echo(line)
+    sys.exit(1)
+
+# 4.  CLI
+@click.group()
+def cli():
+    """Find the first cycle where two runs differ."""
+
+def _diff_options(f):
+    f = click.option("--ignore", multiple=True, type=click.Choice(FIELDS),
+                     help="Do not compare this field (repeatable)")(f)
+    f = click.option("--after", default=2, show_default=True, help="Cycles shown after the divergence")(f)
+    f = click.option("--context", "-C", default=5, show_default=True,
+                     help="Cycles shown before the divergence")(f)
+    return f
+
+@cli.command("diff")
+@click.argument("rec_a", type=click.Path(dir_okay=False, exists=True))
+@click.argument("rec_b", type=click.Path(dir_okay=False, exists=True))
+@_diff_options
+def diff_cmd(rec_a: str, rec_b: str, context: int, after: int, ignore: tuple):
+    """Compare two saved recordings (+RECORD files)."""
+    fields = [f for f in FIELDS if f not in ignore]
+    with open(rec_a, encoding="ascii") as fa, open(rec_b, encoding="ascii") as fb:
+        result = first_divergence(fa, fb, fields, context, after)
+    _report(result)
+
+@cli.command("run")
+@click.argument("program_a")
+@click.argument("program_b", required=False)
+@click.option("--cycles", "-n", default=1000, show_default=True, help="Maximum simulation cycles")
+@click.option("--image-a", type=click.Path(dir_okay=False, exists=True), default=None,
+              help="Testbench image for run A (default: the current build)")
+@click.option("--image-b", type=click.Path(dir_okay=False, exists=True), default=None,
+              help="Testbench image for run B (default: the current build)")
+@click.option("--no-compile", is_flag=True, help="Reuse the existing testbench image")
+@click.option("--backend", "-b", type=click.Choice(list(BACKENDS)), default=DEFAULT_BACKEND,
+              show_default=True, help="Simulator back-end")
+@_diff_options
+def run_cmd(program_a: str, program_b: str | None, cycles: int, image_a: str | None, image_b: str | None,
+            no_compile: bool, backend: str, context: int, after: int, ignore: tuple):
+    """Simulate PROGRAM_A and PROGRAM_B (default: PROGRAM_A again) side by side and diff them live."""
+    fields = [f for f in FIELDS if f not in ignore]
+    opts = SimOptions(cycles=cycles, state_stream=True)
+    sim = get_backend(backend)
+    try:
+        names = [resolve_program(program_a), resolve_program(program_b or program_a)]
+        if not no_compile and not (image_a and image_b):
+            compile_testbench(sim, on_line=lambda _: None, defines=opts.defines)
+        images = [image_a or sim.image_for(opts.defines), image_b or sim.image_for(opts.defines)]
+        cmds = [sim.run_command(_absolute_args(build_simulation_args(name, image, opts)))
+                for name, image in zip(names, images)]
+        with live_lines(cmds[0]) as la, live_lines(cmds[1]) as lb:
+            result = first_divergence(la, lb, fields, context, after)
+    except AsmError as e:
+        click.echo(f"Assembler error: {e}", err=True)
+        sys.exit(1)
+    except SimError as e:
+        click.echo(f"Simulation error: {e}", err=True)
+        sys.exit(1)
+    _report(result)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,95 @@
+"""
+triggers.py
+Trace triggers for the 8-But MightyController testbench.
+
+Instead of cycle windows, per-cycle debug output is switched on and off by
+conditions that the testbench evaluates itself, so nothing outside the
+window is ever formatted:
+• pc:LOOP     / pc:$1B       PC reaches a label or address
+• reg:F=$00                  register equals a value
+• write:$F0   / write:TABLE  RAM byte or output port is written
+Labels are resolved through the assembler's symbol table (the .sym file
+written next to each ROM image). Each side (start / stop) takes at most one
+trigger of each kind; several kinds on one side are OR-ed together.
+
+Usage
+─────
+$ python triggers.py resolve Programs/build/prog.sym --start pc:LOOP --stop write:$F0
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+import click
+
+from assembler import HEX_BYTE, REGISTERS, read_symbols
+
+KINDS = {"pc": "PC", "reg": "REG", "write": "WRITE"}
+
+class TriggerError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class Trigger:
+    kind: str       # "pc", "reg" or "write"
+    value: int      # address, or (register << 8) | byte for "reg"
+
+    def plusarg(self, side: str) -> str:
+        width = 3 if self.kind == "reg" else 2
+        return f"+TRACE_{side}_{KINDS[self.kind]}={self.value:0{width}X}"
+
+def _value(token: str, symbols: Dict[str, int]) -> int:
+    if (m := HEX_BYTE.match(token)):
+        return int(m.group(1), 16)
+    if token in symbols:
+        return symbols[token]
+    raise TriggerError(f"unknown symbol '{token}'")
+
+def parse_trigger(spec: str, symbols: Dict[str, int]) -> Trigger:
+    """Parse one `kind:arg` trigger, resolving labels through `symbols`."""
+    kind, sep, arg = spec.strip().partition(":")
+    kind = kind.lower()
+    if not sep or kind not in KINDS:
+        raise TriggerError(f"malformed trigger '{spec}' (expected pc:, reg: or write:)")
+
+    if kind == "reg":
+        reg, sep, val = arg.partition("=")
+        if not sep or reg.strip().upper() not in REGISTERS:
+            raise TriggerError(f"malformed register trigger '{spec}' (expected reg:F=$00)")
+        return Trigger("reg", (REGISTERS[reg.strip().upper()] << 8) | _value(val.strip(), symbols))
+
+    return Trigger(kind, _value(arg.strip(), symbols))
+
+def trigger_plusargs(start: List[str], stop: List[str], symbols: Dict[str, int]) -> List[str]:
+    """Testbench plusargs for the given start / stop trigger specs."""
+    args: List[str] = []
+    for side, specs in (("START", start), ("STOP", stop)):
+        seen = set()
+        for spec in specs:
+            trig = parse_trigger(spec, symbols)
+            if trig.kind in seen:
+                raise TriggerError(f"only one {trig.kind}: trigger allowed per {side.lower()} condition")
+            seen.add(trig.kind)
+            args.append(trig.plusarg(side))
+    return args
+
+@click.group()
+def cli():
+    """Trace trigger helpers."""
+
+@cli.command("resolve")
+@click.argument("sym_path", type=click.Path(dir_okay=False, exists=True))
+@click.option("--start", multiple=True, help="Start trigger, e.g. pc:LOOP (repeatable)")
+@click.option("--stop", multiple=True, help="Stop trigger, e.g. write:$F0 (repeatable)")
+def resolve_cmd(sym_path: str, start: tuple, stop: tuple):
+    """Print the plusargs for triggers resolved against SYM_PATH."""
+    try:
+        click.echo(" ".join(trigger_plusargs(list(start), list(stop), read_symbols(sym_path))))
+    except TriggerError as e:
+        click.echo(f"Trigger error: {e}", err=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,332 @@
+"""
+vecsim.py
+Lock-step instruction-level simulator for many 8-But MightyController ROMs.
+
+Thousands of machines are held as NumPy arrays (16 registers, NZVC flags,
+256 bytes of memory of which $80-$DF is the 96-byte RAM, and a PC per
+machine) and every step executes one instruction on all of them with
+whole-array operations: no per-machine Python code runs inside the loop.
+
+A step is kept down to a handful of array passes:
+• arrays are address-major (register × machine, address × machine), so
+  machines running the same code read neighbouring memory
+• each memory image is pre-decoded into one 32-bit word per address
+  (fall-through PC, register or branch target, operand byte, control bits),
+  so fetch and decode are a single gather; a store into RAM re-decodes the
+  three words that overlap the written byte
+• every ALU function (as in ALU.v, but for the INC/DEC V flag: see
+  _alu_table), plus the load pass-through and "keep A" for instructions
+  without a register result, is a 64 K-entry table of
+  result | NZVC << 8 | flags-valid << 12, so execute and write-back are one
+  gather and one unconditional scatter
+
+The model follows the ISA reference in README.md, including the parts the
+RTL does not implement yet (LD/ST direct, PC-relative branches), so it also
+serves as a golden model. Unknown opcodes execute as no-ops, as in the RTL.
+A machine halts when its PC leaves its program image; ports $F0-$FF read
+as $00 and writes are latched in `ports`.
+
+Usage
+─────
+$ python vecsim.py run "Programs/asm/test2(ALU).asm" Programs/build --steps 500
+$ python vecsim.py bench "Programs/asm/test3(INC_DEC).asm" --instances 100000
+"""
+from __future__ import annotations
+
+import pathlib, sys, time
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+import click
+import numpy as np
+
+from assembler import OPCODES, RAM_BASE, RAM_END, AsmError, assemble_program, ram_image_path
+from disassembler import ROM_SIZE, rom_paths
+
+REG_NAMES   = "ABCDEFGHIJKLMNOP"
+PORT_BASE   = 0xF0
+CHECK_EVERY = 32                 # steps between "all halted?" checks
+DECODE_CHUNK = 1 << 16           # machines decoded at once (bounds the temporaries)
+
+class VecSimError(ValueError):
+    pass
+
+# 1.  Decode tables
+# ALU functions (index into the ALU table)
+F_PASS, F_ADD, F_SUB, F_AND, F_OR, F_XOR, F_KEEP = range(7)
+# operand B sources
+B_REG, B_IMM, B_MEM = range(3)
+# branch conditions
+C_NEVER, C_ALWAYS, C_ZCLR, C_ZSET = range(4)
+
+# word layout: bits 0-7 fall-through PC (own address when halted), 8-15 register 1 or branch
+# target, 16-23 byte 2 (register 2 / immediate / address), 24-31 control byte:
+# bits 0-2 ALU function, 3-4 B source, 5 store, 6-7 branch condition
+STORE = 1 << 5
+
+def _ctl(fn: int = F_KEEP, src: int = B_REG, store: int = 0, cond: int = C_NEVER) -> int:
+    return fn | src << 3 | store | cond << 6
+
+CONTROL = np.full(256, _ctl(), dtype=np.uint32)       # unknown opcodes: no-op
+for (_mnem, _mode), _opc in OPCODES.items():
+    CONTROL[_opc.code] = {
+        ("LD", "IMM"):  _ctl(F_PASS, B_IMM),
+        ("LD", "DIR"):  _ctl(F_PASS, B_MEM),
+        ("ST", "DIR"):  _ctl(store=STORE),
+        ("ADD", "REG"): _ctl(F_ADD),
+        ("SUB", "REG"): _ctl(F_SUB),
+        ("AND", "REG"): _ctl(F_AND),
+        ("OR",  "REG"): _ctl(F_OR),
+        ("XOR", "REG"): _ctl(F_XOR),
+        ("INC", "IMP"): _ctl(F_ADD, B_IMM),               # A + 1: the immediate is forced to 1
+        ("DEC", "IMP"): _ctl(F_SUB, B_IMM),
+        ("BRA", "REL"): _ctl(cond=C_ALWAYS),
+        ("BNE", "REL"): _ctl(cond=C_ZCLR),
+        ("BEQ", "REL"): _ctl(cond=C_ZSET),
+    }.get((_mnem, _mode), _ctl())
+IS_INCDEC = np.zeros(256, dtype=bool)
+IS_INCDEC[[OPCODES["INC", "IMP"].code, OPCODES["DEC", "IMP"].code]] = True
+IS_BRANCH = (CONTROL >> 6) != C_NEVER
+
+FLAGS_VALID = 1 << 12
+
+def _alu_table() -> np.ndarray:
+    """(7 × 256 × 256,) uint16 of result | NZVC << 8 | FLAGS_VALID.
+
+    Results and flags follow ALU.v with one exception: INC/DEC run as ADD/SUB
+    with B = 1, so V is set only on $7F + 1 and $80 - 1. ALU.v computes the
+    INC/DEC V flag from its B input, which in LOADSTORE is register A
+    (reg_read_addr_B = 0), so the RTL's V there also depends on bit 7 of A.
+    """
+    a = np.arange(256, dtype=np.int32)[:, None]
+    b = np.arange(256, dtype=np.int32)[None, :]
+    a7, b7 = a >> 7 & 1, b >> 7 & 1
+    table = np.zeros((7, 256, 256), dtype=np.uint16)
+    for fn, raw in ((F_PASS, b + 0 * a), (F_ADD, a + b), (F_SUB, a - b),
+                    (F_AND, a & b), (F_OR, a | b), (F_XOR, a ^ b), (F_KEEP, a + 0 * b)):
+        res = raw & 0xFF
+        if fn in (F_PASS, F_KEEP):                                   # loads, stores, branches: CCR kept
+            table[fn] = res
+            continue
+        r7 = res >> 7
+        z = (res == 0).astype(np.int32)
+        if fn == F_ADD:
+            v, c = (a7 ^ r7) & ~(a7 ^ b7) & 1, raw >> 8 & 1
+        elif fn == F_SUB:
+            v, c = (a7 ^ r7) & (a7 ^ b7) & 1, raw >> 8 & 1          # borrow: bit 8 of the 9-bit difference
+        else:
+            v = c = np.zeros_like(res)
+        table[fn] = res | (r7 << 3 | z << 2 | v << 1 | c) << 8 | FLAGS_VALID
+    return table.reshape(-1)
+
+ALU = _alu_table()
+
+# 2.  Machine state
+@dataclass
+class Machines:
+    names:  List[str]
+    regs:   np.ndarray           # (16, N) uint8
+    nzvc:   np.ndarray           # (N,) uint8, bit 3 N .. bit 0 C, like the CCR
+    mem:    np.ndarray           # (256, N) uint8: ROM $00-$7F, RAM $80-$DF, port inputs $F0-$FF
+    pc:     np.ndarray           # (N,) uint8
+    ports:  np.ndarray           # (16, N) uint8, last value written to each output port
+    steps:  np.ndarray           # (N,) instructions executed
+    ends:   np.ndarray           # (N,) program image size; PC >= end halts the machine
+    words:  np.ndarray           # (256, N) uint32 pre-decoded instruction at each address
+    cols:   np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.cols = np.arange(len(self.names), dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def ram(self) -> np.ndarray:
+        """(N, 96) view of each machine's RAM."""
+        return self.mem[RAM_BASE:RAM_END].T
+
+    @property
+    def registers(self) -> np.ndarray:
+        """(N, 16) view of each machine's register file."""
+        return self.regs.T
+
+    @property
+    def flags(self) -> np.ndarray:
+        """(N, 4) bool [N, Z, V, C]."""
+        return (self.nzvc[:, None] >> np.array([3, 2, 1, 0], dtype=np.uint8) & 1).astype(bool)
+
+    @property
+    def halted(self) -> np.ndarray:
+        return self.pc.astype(np.int64) >= self.ends
+
+def _decode(mem: np.ndarray, ends: np.ndarray, addrs: np.ndarray) -> np.ndarray:
+    """Words for the instructions at `addrs` ((k, N) addresses into (256, N) `mem`)."""
+    cols = np.arange(mem.shape[1])
+    op = mem[addrs, cols]
+    b1 = mem[(addrs + 1) & 0xFF, cols].astype(np.uint32)
+    b2 = mem[(addrs + 2) & 0xFF, cols].astype(np.uint32)
+    halted = addrs >= ends
+    nxt = np.where(halted, addrs, (addrs + 3) & 0xFF)
+    target = (addrs + 3 + b1.astype(np.int8)) & 0xFF                  # relative to the next instruction
+    b1 = np.where(IS_BRANCH[op], target, b1 & 0x0F)
+    b2 = np.where(IS_INCDEC[op], 1, b2)
+    ctl = np.where(halted, _ctl(), CONTROL[op])
+    return (nxt | b1 << 8 | b2 << 16 | ctl << 24).astype(np.uint32)
+
+def _decode_all(mem: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    words = np.empty(mem.shape, dtype=np.uint32)
+    addrs = np.arange(256)[:, None]
+    for lo in range(0, mem.shape[1], DECODE_CHUNK):
+        hi = lo + DECODE_CHUNK
+        words[:, lo:hi] = _decode(mem[:, lo:hi], ends[lo:hi], addrs)
+    return words
+
+def load_machines(names: Sequence[str], roms: Sequence[bytes], rams: Sequence[bytes] | None = None,
+                  halt_at_end: bool = True) -> Machines:
+    """Machines at reset: ROM (and optional RAM-init) images loaded, PC = 0.
+
+    Identical images are copied with one broadcast, so loading many copies of
+    one program is cheap. Without `halt_at_end` a machine runs on past its
+    image (zero bytes are no-ops) until the step budget is spent.
+    """
+    n = len(roms)
+    mem = np.zeros((256, n), dtype=np.uint8)
+    ends = np.zeros(n, dtype=np.int64)
+    images: dict = {}
+    for i, rom in enumerate(roms):
+        ram = rams[i] if rams else b""
+        if len(rom) > ROM_SIZE:
+            raise VecSimError(f"{names[i]}: {len(rom)} bytes does not fit the {ROM_SIZE}-byte ROM")
+        if len(ram) > RAM_END - RAM_BASE:
+            raise VecSimError(f"{names[i]}: RAM image of {len(ram)} bytes overflows $80-$DF")
+        images.setdefault((rom, ram), []).append(i)
+    for (rom, ram), idx in images.items():
+        image = np.zeros(256, dtype=np.uint8)
+        image[:len(rom)] = np.frombuffer(rom, dtype=np.uint8)
+        image[RAM_BASE:RAM_BASE + len(ram)] = np.frombuffer(ram, dtype=np.uint8)
+        mem[:, idx] = image[:, None]
+        ends[idx] = len(rom) if halt_at_end else 256
+    return Machines(list(names), np.zeros((16, n), dtype=np.uint8), np.zeros(n, dtype=np.uint8),
+                    mem, np.zeros(n, dtype=np.uint8), np.zeros((16, n), dtype=np.uint8),
+                    np.zeros(n, dtype=np.int64), ends, _decode_all(mem, ends))
+
+def read_program(target: str) -> List[tuple]:
+    """(name, rom, ram) for an .asm source, a .bin image or a directory of images."""
+    if target.lower().endswith(".asm"):
+        prog = assemble_program(pathlib.Path(target).read_text(encoding="utf-8").splitlines())
+        return [(target, prog.rom, prog.ram)]
+    found = []
+    for path in rom_paths([target]):
+        ram = ram_image_path(path)
+        found.append((str(path), path.read_bytes(), ram.read_bytes() if ram.exists() else b""))
+    return found
+
+def load_files(targets: Sequence[str], copies: int = 1, halt_at_end: bool = True) -> Machines:
+    """Machines for .asm sources and .bin images, each loaded `copies` times."""
+    programs = [p for t in targets for p in read_program(t)]
+    if not programs:
+        raise VecSimError("no programs given")
+    names, roms, rams = zip(*(p for p in programs for _ in range(copies)))
+    return load_machines(names, roms, rams, halt_at_end)
+
+# 3.  Execution
+def step(m: Machines):
+    """Execute one instruction on every machine (halted machines stay put)."""
+    n, cols = len(m), m.cols
+    regs = m.regs.reshape(-1)
+
+    w = m.words.reshape(-1).take(m.pc.astype(np.intp) * n + cols)
+    ctl = (w >> 24).astype(np.uint8)
+    b2 = (w >> 16).astype(np.uint8)
+    r1 = (w >> 8 & 0x0F).astype(np.intp) * n + cols
+
+    a = regs.take(r1)
+    b = regs.take((b2 & 0x0F).astype(np.intp) * n + cols)
+    src = ctl >> 3 & 3
+    np.copyto(b, b2, where=src == B_IMM)
+    if (loads := src == B_MEM).any():
+        b[loads] = m.mem[b2[loads], cols[loads]]
+
+    out = ALU.take((ctl & 7).astype(np.uint32) << 16 | a.astype(np.uint32) << 8 | b)
+    regs[r1] = out
+    np.copyto(m.nzvc, (out >> 8 & 0x0F).astype(np.uint8), where=(out & FLAGS_VALID) != 0)
+
+    if (stores := (ctl & STORE) != 0).any():
+        _store(m, cols[stores], b2[stores], a[stores])
+
+    cond = ctl >> 6
+    taken = (cond == C_ALWAYS) | (cond == C_ZCLR + (m.nzvc >> 2 & 1))
+    nxt = w.astype(np.uint8)
+    m.steps += nxt != m.pc
+    m.pc = np.where(taken, (w >> 8).astype(np.uint8), nxt)
+
+def _store(m: Machines, idx: np.ndarray, addr: np.ndarray, value: np.ndarray):
+    ram = (addr >= RAM_BASE) & (addr < RAM_END)
+    m.mem[addr[ram], idx[ram]] = value[ram]
+    port = addr >= PORT_BASE
+    m.ports[addr[port] - PORT_BASE, idx[port]] = value[port]
+    if ram.any():                       # the three instructions overlapping the byte change
+        rows = idx[ram]
+        addrs = (addr[ram].astype(np.int64)[None, :] - np.arange(3)[:, None]) & 0xFF
+        m.words[addrs, rows] = _decode(m.mem[:, rows], m.ends[rows], addrs)
+
+def run(m: Machines, max_steps: int) -> int:
+    """Step every machine until all have halted or `max_steps` steps; returns the steps taken."""
+    for n in range(max_steps):
+        if n % CHECK_EVERY == 0 and m.halted.all():
+            return n
+        step(m)
+    return max_steps
+
+def register_line(m: Machines, i: int) -> str:
+    return " ".join(f"{REG_NAMES[r]}={m.regs[r, i]:02x}" for r in range(16))
+
+# 4.  CLI
+@click.group()
+def cli():
+    """Vectorised instruction-level simulator for many ROM images."""
+
+def _load(targets: Sequence[str], copies: int = 1, halt_at_end: bool = True) -> Machines:
+    try:
+        return load_files(targets, copies, halt_at_end)
+    except AsmError as e:
+        click.echo(f"Assembler error: {e}", err=True)
+        sys.exit(1)
+    except VecSimError as e:
+        click.echo(f"Vecsim error: {e}", err=True)
+        sys.exit(1)
+
+@cli.command("run")
+@click.argument("targets", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--steps", "-n", default=1000, show_default=True, help="Maximum instructions per machine")
+def run_cmd(targets: tuple, steps: int):
+    """Run every program in TARGETS (.asm, .bin or directories) and print its final state."""
+    m = _load(targets)
+    run(m, steps)
+    for i, name in enumerate(m.names):
+        state = "halted" if m.halted[i] else "running"
+        click.echo(f"{name}: {m.steps[i]} instructions, {state}, PC={m.pc[i]:02x} NZVC={m.nzvc[i]:04b}")
+        click.echo(f"  {register_line(m, i)}")
+
+@cli.command("bench")
+@click.argument("targets", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--instances", "-i", default=100000, show_default=True, help="Copies of each program")
+@click.option("--steps", "-n", default=200, show_default=True, help="Lock-step steps to time")
+def bench_cmd(targets: tuple, instances: int, steps: int):
+    """Aggregate instructions per second over INSTANCES copies of each program.
+
+    Machines do not halt at the end of their image, so every step executes
+    one instruction on every machine.
+    """
+    m = _load(targets, instances, halt_at_end=False)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        step(m)
+    secs = time.perf_counter() - t0
+    total = int(m.steps.sum())
+    click.echo(f"[vecsim] {len(m)} machines × {steps} steps = {total} instructions in {secs:.3f} s "
+               f"({total / secs / 1e6:.1f} M instructions/s)")
+
+if __name__ == "__main__":
+    cli()
@@ -9,17 +9,32 @@ module computer_TB;
     reg clk = 0;  always #10 clk = ~clk;
     reg reset = 0;
 
-    computer dut (
+`ifdef PREFETCH
+    localparam PREFETCH_MODE = 1;       // compiled with -DPREFETCH
+`else
+    localparam PREFETCH_MODE = 0;
+`endif
+
+    // Fast build (-DFAST, picked by the tools when no debug output is requested): the per-cycle
+    // debug printing, trace triggers and ROM_output bookkeeping are compiled out and debug_inner
+    // is tied low; program output, recording, coverage, perf counters and co-simulation remain.
+
+    computer #(.PREFETCH(PREFETCH_MODE)) dut (
         .clk     (clk),
         .reset   (reset),
-        .debug_inner (debug_inner),
+        .debug_inner (debug_inner_gated),
         .io_data (io_data),
         .io_addr (io_addr),
         .io_oe   (io_oe),
         .io_we   (io_we)
     );
 
+`ifdef PREFETCH
+    // The PC register runs ahead of the executing instruction; report the issued address instead
+    wire [7:0] PC = dut.cpu1.control_unit1.issue_pc;
+`else
     wire [7:0] PC = dut.cpu1.data_path1.PC;
+`endif
     wire [7:0] IR = dut.cpu1.data_path1.IR_reg;
     
     // Access register file contents (A=register 0, B=register 1, etc.)
@@ -27,7 +42,20 @@ module computer_TB;
     wire [7:0] Reg_B = dut.cpu1.reg_file.registers[1];  // Register B
     wire [7:0] Reg_C = dut.cpu1.reg_file.registers[2];  // Register C
     wire [7:0] Reg_D = dut.cpu1.reg_file.registers[3];  // Register D
+    wire [7:0] Reg_E = dut.cpu1.reg_file.registers[4];
+    wire [7:0] Reg_F = dut.cpu1.reg_file.registers[5];
+    wire [7:0] Reg_G = dut.cpu1.reg_file.registers[6];
+    wire [7:0] Reg_H = dut.cpu1.reg_file.registers[7];
+    wire [7:0] Reg_I = dut.cpu1.reg_file.registers[8];
+    wire [7:0] Reg_J = dut.cpu1.reg_file.registers[9];
+    wire [7:0] Reg_K = dut.cpu1.reg_file.registers[10];
+    wire [7:0] Reg_L = dut.cpu1.reg_file.registers[11];
+    wire [7:0] Reg_M = dut.cpu1.reg_file.registers[12];
+    wire [7:0] Reg_N = dut.cpu1.reg_file.registers[13];
+    wire [7:0] Reg_O = dut.cpu1.reg_file.registers[14];
+    wire [7:0] Reg_P = dut.cpu1.reg_file.registers[15];
 
+`ifndef FAST
     // Output monitoring signals for GTKWave
     reg [7:0] ROM_output;
     reg ROM_valid;
@@ -38,6 +66,7 @@ module computer_TB;
         ROM_valid = 0;
         ROM_sequence_count = 0;
     end
+`endif
     
     integer cycles = 0;
     
@@ -81,10 +110,36 @@ module computer_TB;
         end
         endtask
 
+        // RAM-init image from the assembler's .data section: byte i goes to $80+i
+        task load_ram;
+            input [8*128-1:0] filename;
+            reg   [7:0]       data_byte;
+            integer           fd, idx, bytes_read;
+        begin
+            fd = $fopen(filename, "rb");
+            if (fd == 0) begin
+                $display("ERROR: could not open RAM file %0s", filename);
+                $finish;
+            end
+            idx = 0;
+            while (!$feof(fd) && idx < 96) begin
+                bytes_read = $fread(data_byte, fd);
+                if (bytes_read > 0) begin
+                    dut.memory1.ram1.RAM[idx] = data_byte;
+                    idx = idx + 1;
+                end
+            end
+            $fclose(fd);
+            $display("RAM preloaded with %0d bytes", idx);
+        end
+        endtask
+
     // Dynamic ROM file loading
     reg [8*128-1:0] dynamic_rom_file;
     reg [8*64-1:0] dynamic_test_name;
-    reg integer debug_cycles = 1000;      // Default to 1000 cycles if not specified
+    reg [8*128-1:0] dynamic_ram_file;
+    reg ram_file_given = 0;
+    integer debug_cycles = 1000;          // Default to 1000 cycles if not specified
     
     // Enhanced debugging parameters
     reg     debug_enable = 0;              // Enable/disable debug output (disabled by default - GUI controls this)
@@ -98,7 +153,250 @@ module computer_TB;
     reg     debug_verbose = 0;             // Extra verbose debugging
     integer debug_start_cycle = 0;        // Start debugging from this cycle
     integer debug_end_cycle = -1;         // End debugging at this cycle (-1 = no limit)
-    
+
+    // Recorded-run output (read back by src/software/recording.py)
+    reg [8*128-1:0] record_file;
+    integer record_mcd = 0;               // Multichannel descriptor (bit 0 = stdout stream), 0 = off
+    integer checkpoint_every = 1000;      // Full snapshot interval in cycles
+    reg     record_active = 0;            // Set by run_prog once reset is released
+    reg [7:0] shadow_regs  [0:15];        // Last recorded state, used to emit deltas
+    reg [7:0] shadow_ram   [0:95];
+    reg [7:0] shadow_ports [0:15];
+
+    // Trace triggers (+TRACE_START_* / +TRACE_STOP_*, built by src/software/triggers.py)
+    reg        trace_on = 1;              // Gates debug output; closed until a start trigger fires
+    reg        trace_was_on = 0;          // Recording emits a fresh checkpoint whenever the window opens
+    reg        trig_start_pc_en = 0, trig_start_reg_en = 0, trig_start_wr_en = 0;
+    reg        trig_stop_pc_en  = 0, trig_stop_reg_en  = 0, trig_stop_wr_en  = 0;
+    reg [7:0]  trig_start_pc, trig_stop_pc;      // PC value
+    reg [11:0] trig_start_reg, trig_stop_reg;    // {register, value}
+    reg [7:0]  trig_start_wr, trig_stop_wr;      // RAM / port address written
+`ifdef FAST
+    wire       debug_inner_gated = 1'b0;
+`else
+    wire       debug_inner_gated = debug_inner && trace_on;
+`endif
+
+    // Performance counters (+PERF): sampled every cycle, printed once as PERF lines at the end
+    // (parsed by src/software/perf.py)
+    reg        perf_on = 0;
+    integer    perf_cycles = 0;
+    integer    perf_state   [0:7];        // Cycles per FSM state
+    integer    perf_retired [0:4];        // Instructions retired: load/store, ALU, INC/DEC, branch, other
+    integer    perf_taken = 0, perf_not_taken = 0;
+    integer    perf_ram_rd = 0, perf_ram_wr = 0, perf_port_rd = 0, perf_port_wr = 0;
+
+    function integer perf_class;
+        input [7:0] op;
+        begin
+            case (op[7:4])
+                4'h8:    perf_class = 0;
+                4'h9:    perf_class = 1;
+                4'hA:    perf_class = 2;
+                4'h2:    perf_class = 3;
+                default: perf_class = 4;
+            endcase
+        end
+    endfunction
+
+    always @(negedge clk) begin
+        if (perf_on && record_active) begin
+            perf_cycles = perf_cycles + 1;
+            perf_state[dut.cpu1.control_unit1.state] = perf_state[dut.cpu1.control_unit1.state] + 1;
+            // An instruction retires when the FSM returns to FETCH
+            if (dut.cpu1.control_unit1.state != 0 && dut.cpu1.control_unit1.next == 0)
+                perf_retired[perf_class(IR)] = perf_retired[perf_class(IR)] + 1;
+            if (dut.cpu1.control_unit1.state == 5 && dut.cpu1.control_unit1.cycle_count == 1) begin
+                if (dut.cpu1.PC_Load) perf_taken = perf_taken + 1;
+                else                  perf_not_taken = perf_not_taken + 1;
+            end
+            if (dut.cpu1.addr_sel && dut.memory1.in_ram_range) begin
+                if (dut.memory1.write) perf_ram_wr = perf_ram_wr + 1;
+                else                   perf_ram_rd = perf_ram_rd + 1;
+            end
+            if (dut.cpu1.addr_sel && dut.memory1.in_port_range) begin
+                if (dut.memory1.write) perf_port_wr = perf_port_wr + 1;
+                else                   perf_port_rd = perf_port_rd + 1;
+            end
+        end
+    end
+
+    task perf_reset;
+        integer k;
+    begin
+        for (k = 0; k < 8; k = k + 1) perf_state[k] = 0;
+        for (k = 0; k < 5; k = k + 1) perf_retired[k] = 0;
+    end
+    endtask
+
+    task perf_report;
+        integer k, retired;
+    begin
+        retired = 0;
+        for (k = 0; k < 5; k = k + 1) retired = retired + perf_retired[k];
+        $display("=== Performance counters ===");
+        $display("PERF cycles %0d", perf_cycles);
+        $display("PERF retired %0d", retired);
+        $display("PERF state FETCH %0d",     perf_state[0]);
+        $display("PERF state DECODE %0d",    perf_state[1]);
+        $display("PERF state EXECUTE %0d",   perf_state[2]);
+        $display("PERF state LOADSTORE %0d", perf_state[3]);
+        $display("PERF state DATA %0d",      perf_state[4]);
+        $display("PERF state BRANCH %0d",    perf_state[5]);
+        $display("PERF class LOADSTORE %0d", perf_retired[0]);
+        $display("PERF class ALU %0d",       perf_retired[1]);
+        $display("PERF class INCDEC %0d",    perf_retired[2]);
+        $display("PERF class BRANCH %0d",    perf_retired[3]);
+        $display("PERF class OTHER %0d",     perf_retired[4]);
+        $display("PERF branch taken %0d",     perf_taken);
+        $display("PERF branch not_taken %0d", perf_not_taken);
+        $display("PERF access ram_read %0d",   perf_ram_rd);
+        $display("PERF access ram_write %0d",  perf_ram_wr);
+        $display("PERF access port_read %0d",  perf_port_rd);
+        $display("PERF access port_write %0d", perf_port_wr);
+    end
+    endtask
+
+    // Coverage database (+COVERAGE=file, merged and reported by src/software/coverage.py)
+    reg [8*128-1:0] coverage_file;
+    reg        coverage_on = 0;
+    integer    cov_op    [0:255];         // Instructions executed, by opcode
+    integer    cov_taken [0:255];         // Branch outcomes, by opcode
+    integer    cov_not   [0:255];
+    reg [15:0] cov_flags [0:255];         // NZVC values produced (one bit per value), by opcode
+    integer    cov_rd    [0:255];         // Data-cycle reads / writes, by address
+    integer    cov_wr    [0:255];
+
+    task coverage_reset;
+        integer k;
+    begin
+        for (k = 0; k < 256; k = k + 1) begin
+            cov_op[k] = 0;  cov_taken[k] = 0;  cov_not[k] = 0;
+            cov_flags[k] = 0;  cov_rd[k] = 0;  cov_wr[k] = 0;
+        end
+    end
+    endtask
+
+    // One line per table: a tag, then 256 fixed-width hex fields
+    task coverage_write;
+        integer fd, k;
+    begin
+        fd = $fopen(coverage_file, "w");
+        if (fd == 0) begin
+            $display("ERROR: could not open coverage file %0s", coverage_file);
+        end else begin
+            $fwrite(fd, "# coverage runs=1 cycles=%0d\n", cycles);
+            $fwrite(fd, "O ");  for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%08h", cov_op[k]);
+            $fwrite(fd, "\nT "); for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%08h", cov_taken[k]);
+            $fwrite(fd, "\nN "); for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%08h", cov_not[k]);
+            $fwrite(fd, "\nF "); for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%04h", cov_flags[k]);
+            $fwrite(fd, "\nR "); for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%08h", cov_rd[k]);
+            $fwrite(fd, "\nW "); for (k = 0; k < 256; k = k + 1) $fwrite(fd, "%08h", cov_wr[k]);
+            $fwrite(fd, "\n");
+            $fclose(fd);
+            $display("Coverage written to %0s", coverage_file);
+        end
+    end
+    endtask
+
+    always @(negedge clk) begin
+        if (coverage_on && record_active) begin
+            if (dut.cpu1.control_unit1.state == 1)                         // DECODE: once per instruction
+                cov_op[IR] = cov_op[IR] + 1;
+            if (dut.cpu1.control_unit1.state == 5 && dut.cpu1.control_unit1.cycle_count == 1) begin
+                if (dut.cpu1.PC_Load) cov_taken[IR] = cov_taken[IR] + 1;
+                else                  cov_not[IR]   = cov_not[IR] + 1;
+            end
+            if (dut.cpu1.CCR_Load)
+                cov_flags[IR] = cov_flags[IR] | (16'h1 << dut.cpu1.NZVC);
+            if (dut.cpu1.addr_sel && dut.memory1.address >= 8'h80) begin
+                if (dut.memory1.write) cov_wr[dut.memory1.address] = cov_wr[dut.memory1.address] + 1;
+                else                   cov_rd[dut.memory1.address] = cov_rd[dut.memory1.address] + 1;
+            end
+        end
+    end
+
+    // Co-simulation bridge (+COSIM_TX / +COSIM_RX, driven by src/software/cosim.py).
+    // Port writes and reads are queued as text lines and exchanged with the Python
+    // peripheral models once every cosim_batch cycles; between syncs, port reads
+    // return the input values the models published at the last sync.
+    reg [8*128-1:0] cosim_tx_file, cosim_rx_file;
+    integer    cosim_tx = 0, cosim_rx = 0;
+    integer    cosim_batch = 64;
+    reg        cosim_active = 0;
+    reg        cosim_in_access = 0;       // Address currently in the port window
+    reg        cosim_wrote = 0;           // ... and this access was a write
+    reg [3:0]  cosim_port;
+    reg [7:0]  cosim_in [0:15];           // Input-port values from the last sync
+    assign io_data = (cosim_active && io_oe && !io_we) ? cosim_in[io_addr] : 8'bz;
+
+    task cosim_open;
+        integer k;
+    begin
+        if ($value$plusargs("COSIM_BATCH=%d", cosim_batch) && cosim_batch < 1) cosim_batch = 1;
+        cosim_tx = $fopen(cosim_tx_file, "w");
+        cosim_rx = $fopen(cosim_rx_file, "r");
+        if (cosim_tx == 0 || cosim_rx == 0) begin
+            $display("ERROR: could not open co-simulation channels %0s / %0s", cosim_tx_file, cosim_rx_file);
+            $finish;
+        end
+        for (k = 0; k < 16; k = k + 1) cosim_in[k] = 8'h00;
+        cosim_active = 1;
+        $display("Co-simulation bridge active (sync every %0d cycles)", cosim_batch);
+    end
+    endtask
+
+    // End of batch: hand over the queued traffic, read back 16 input-port bytes
+    task cosim_sync;
+        integer k, r;
+        reg [7:0] val;
+    begin
+        $fwrite(cosim_tx, "S %0d\n", cycles);
+        $fflush(cosim_tx);
+        for (k = 0; k < 16; k = k + 1) begin
+            r = $fscanf(cosim_rx, "%h", val);
+            if (r != 1) begin
+                $display("ERROR: co-simulation peer closed the channel");
+                $finish;
+            end
+            cosim_in[k] = val;
+        end
+    end
+    endtask
+
+    task cosim_sample;
+    begin
+        if (io_we && !cosim_wrote) begin
+            $fwrite(cosim_tx, "W %0d %01h %02h\n", cycles, io_addr, io_data);
+            cosim_wrote = 1;
+        end
+        if (io_oe) begin
+            cosim_in_access = 1;
+            cosim_port = io_addr;
+        end else if (cosim_in_access) begin
+            // Access over: one that never wrote was a read
+            if (!cosim_wrote) $fwrite(cosim_tx, "R %0d %01h\n", cycles, cosim_port);
+            cosim_in_access = 0;
+            cosim_wrote = 0;
+        end
+        if (cycles % cosim_batch == 0) cosim_sync();
+    end
+    endtask
+
+    function trigger_hit;
+        input        pc_en;
+        input [7:0]  pc_val;
+        input        reg_en;
+        input [11:0] reg_val;
+        input        wr_en;
+        input [7:0]  wr_addr;
+        begin
+            trigger_hit = (pc_en  && PC == pc_val) ||
+                          (reg_en && dut.cpu1.reg_file.registers[reg_val[11:8]] == reg_val[7:0]) ||
+                          (wr_en  && dut.memory1.write && dut.memory1.address == wr_addr);
+        end
+    endfunction
+
     // Default to a simple test if no file specified
     initial begin
         if ($value$plusargs("ROMFILE=%s", dynamic_rom_file)) begin
@@ -107,6 +405,11 @@ module computer_TB;
             dynamic_rom_file = "ROM Programs/build/counter.bin";
             $display("No ROM file specified, using default: %0s", dynamic_rom_file);
         end
+
+        if ($value$plusargs("RAMFILE=%s", dynamic_ram_file)) begin
+            ram_file_given = 1;
+            $display("Loading RAM image: %0s", dynamic_ram_file);
+        end
         
         if ($value$plusargs("TESTNAME=%s", dynamic_test_name)) begin
             $display("Test name: %0s", dynamic_test_name);
@@ -120,7 +423,12 @@ module computer_TB;
         end else begin
             $display("Using default cycles: %0d", debug_cycles);
         end
-        
+
+`ifdef FAST
+        if ($test$plusargs("DEBUG") || $test$plusargs("DEBUG_VERBOSE") ||
+            $test$plusargs("TRACE_START_PC") || $test$plusargs("TRACE_START_REG") || $test$plusargs("TRACE_START_WRITE"))
+            $display("Fast testbench build: debug output and trace triggers are compiled out");
+`else
         if ($test$plusargs("DEBUG")) begin
             debug_enable = 1;
             $display("Debug mode enabled");
@@ -181,6 +489,112 @@ module computer_TB;
         if ($value$plusargs("DEBUG_END=%d", debug_end_cycle)) begin
             $display("Debug output ends at cycle: %0d", debug_end_cycle);
         end
+`endif
+
+        if ($value$plusargs("CHECKPOINT=%d", checkpoint_every)) begin
+            if (checkpoint_every < 1) checkpoint_every = 1;
+        end
+
+        if ($value$plusargs("RECORD=%s", record_file)) begin
+            record_mcd = $fopen(record_file);
+            if (record_mcd == 0)
+                $display("ERROR: could not open record file %0s", record_file);
+            else
+                $display("Recording run to %0s (checkpoint every %0d cycles)", record_file, checkpoint_every);
+        end
+
+`ifndef FAST
+        if ($value$plusargs("TRACE_START_PC=%h", trig_start_pc))     trig_start_pc_en = 1;
+        if ($value$plusargs("TRACE_START_REG=%h", trig_start_reg))   trig_start_reg_en = 1;
+        if ($value$plusargs("TRACE_START_WRITE=%h", trig_start_wr))  trig_start_wr_en = 1;
+        if ($value$plusargs("TRACE_STOP_PC=%h", trig_stop_pc))       trig_stop_pc_en = 1;
+        if ($value$plusargs("TRACE_STOP_REG=%h", trig_stop_reg))     trig_stop_reg_en = 1;
+        if ($value$plusargs("TRACE_STOP_WRITE=%h", trig_stop_wr))    trig_stop_wr_en = 1;
+        if (trig_start_pc_en || trig_start_reg_en || trig_start_wr_en) begin
+            trace_on = 0;
+            $display("Trace output waits for a start trigger");
+        end
+`endif
+
+        if ($test$plusargs("PERF")) begin
+            perf_reset();
+            perf_on = 1;
+            $display("Performance counters enabled");
+        end
+
+        if ($value$plusargs("COVERAGE=%s", coverage_file)) begin
+            coverage_reset();
+            coverage_on = 1;
+            $display("Collecting coverage into %0s", coverage_file);
+        end
+
+        if ($value$plusargs("COSIM_TX=%s", cosim_tx_file) && $value$plusargs("COSIM_RX=%s", cosim_rx_file))
+            cosim_open();
+
+        // Same record lines on stdout, for the GUI's live state panel
+        if ($test$plusargs("STATE_STREAM")) begin
+            record_mcd = record_mcd | 1;
+            $display("State stream enabled");
+        end
+    end
+
+    // Full snapshot: @K cycle pc ir nzvc state <regs> <ram> <ports>
+    task record_checkpoint;
+        integer k;
+    begin
+        $fwrite(record_mcd, "@K %0d %02h %02h %01h %0d ", cycles, PC, IR,
+                dut.cpu1.data_path1.CCR, dut.cpu1.control_unit1.state);
+        for (k = 0; k < 16; k = k + 1) begin
+            shadow_regs[k] = dut.cpu1.reg_file.registers[k];
+            $fwrite(record_mcd, "%02h", shadow_regs[k]);
+        end
+        $fwrite(record_mcd, " ");
+        for (k = 0; k < 96; k = k + 1) begin
+            shadow_ram[k] = dut.memory1.ram1.RAM[k];
+            $fwrite(record_mcd, "%02h", shadow_ram[k]);
+        end
+        $fwrite(record_mcd, " ");
+        for (k = 0; k < 16; k = k + 1) begin
+            shadow_ports[k] = dut.memory1.output_ports[k];
+            $fwrite(record_mcd, "%02h", shadow_ports[k]);
+        end
+        $fwrite(record_mcd, "\n");
+    end
+    endtask
+
+    // Per-cycle delta: @C header followed by @R / @M / @P for every changed location
+    task record_delta;
+        integer k;
+    begin
+        $fwrite(record_mcd, "@C %0d %02h %02h %01h %0d\n", cycles, PC, IR,
+                dut.cpu1.data_path1.CCR, dut.cpu1.control_unit1.state);
+        for (k = 0; k < 16; k = k + 1)
+            if (dut.cpu1.reg_file.registers[k] !== shadow_regs[k]) begin
+                shadow_regs[k] = dut.cpu1.reg_file.registers[k];
+                $fwrite(record_mcd, "@R %0d %02h\n", k, shadow_regs[k]);
+            end
+        for (k = 0; k < 96; k = k + 1)
+            if (dut.memory1.ram1.RAM[k] !== shadow_ram[k]) begin
+                shadow_ram[k] = dut.memory1.ram1.RAM[k];
+                $fwrite(record_mcd, "@M %02h %02h\n", k + 8'h80, shadow_ram[k]);
+            end
+        for (k = 0; k < 16; k = k + 1)
+            if (dut.memory1.output_ports[k] !== shadow_ports[k]) begin
+                shadow_ports[k] = dut.memory1.output_ports[k];
+                $fwrite(record_mcd, "@P %0d %02h\n", k, shadow_ports[k]);
+            end
+    end
+    endtask
+
+    // Sample on the falling edge so every posedge update of the cycle has settled
+    always @(negedge clk) begin
+        if (record_active && record_mcd != 0 && trace_on) begin
+            if (cycles % checkpoint_every == 0 || !trace_was_on)
+                record_checkpoint();
+            else
+                record_delta();
+        end
+        trace_was_on = trace_on;
     end
 
     task run_prog;
@@ -197,22 +611,39 @@ module computer_TB;
 
         load_rom(romfile);
 
-        reset = 0; repeat (10) @(posedge clk);
+        reset = 0;
+        if (ram_file_given) load_ram(dynamic_ram_file);
+        repeat (10) @(posedge clk);
         dut.cpu1.data_path1.PC = base_addr;
         reset = 1;
 
         start_cycles = cycles;
         done = 0;
         ROM_count = 0;
+`ifndef FAST
         ROM_valid = (test_name != {8*32{1'b0}});
+`endif
+        record_active = 1;
         
         $display("Program execution started at cycle %0d, PC set to 0x%02h", cycles, base_addr);
         
         for (n = 0; n < max_cycles && !done; n = n + 1) begin
             @(posedge clk); cycles = cycles + 1;
+
+`ifndef FAST
+            // Trace triggers open and close the debug output window
+            if (!trace_on && trigger_hit(trig_start_pc_en, trig_start_pc, trig_start_reg_en,
+                                         trig_start_reg, trig_start_wr_en, trig_start_wr)) begin
+                trace_on = 1;
+                $display("  [Cycle %0d] Trace started (PC=0x%02h)", cycles, PC);
+            end else if (trace_on && trigger_hit(trig_stop_pc_en, trig_stop_pc, trig_stop_reg_en,
+                                                 trig_stop_reg, trig_stop_wr_en, trig_stop_wr)) begin
+                trace_on = 0;
+                $display("  [Cycle %0d] Trace stopped (PC=0x%02h)", cycles, PC);
+            end
             
             // Monitor register changes - show values when registers are written (only if inner workings enabled)
-            if (dut.cpu1.reg_write_enable && debug_enable && debug_inner) begin
+            if (dut.cpu1.reg_write_enable && debug_enable && debug_inner && trace_on) begin
                 $display("  [Cycle %0d] REG_WRITE: R%0d = 0x%02h", 
                          cycles, dut.cpu1.reg_write_addr, dut.cpu1.reg_write_data);
                 $display("                Current register values: A=0x%02h B=0x%02h C=0x%02h D=0x%02h", 
@@ -220,7 +651,7 @@ module computer_TB;
             end
             
             // Debug monitoring for PC, IR, Registers, State
-            if (debug_enable && cycles >= debug_start_cycle && 
+            if (debug_enable && trace_on && cycles >= debug_start_cycle && 
                (debug_end_cycle == -1 || cycles <= debug_end_cycle)) begin
                 
                 if (debug_pc || debug_ir || debug_regs || debug_state) begin
@@ -242,6 +673,7 @@ module computer_TB;
                     end
                 end
             end
+`endif
             
             // Enhanced I/O monitoring
             if (io_we) begin
@@ -250,22 +682,54 @@ module computer_TB;
                 else begin
                     $display("  [Cycle %0d] F(%0d) = %0d (0x%02h)", cycles, ROM_count, io_data, io_data);
                     
+`ifndef FAST
                     ROM_output = io_data;  // Update GTKWave signal
                     ROM_sequence_count = ROM_count;  // Update sequence counter for GTKWave
+`endif
                     ROM_count = ROM_count + 1;
                 end
             end
             
+            // Port traffic to the Python peripheral models
+            if (cosim_active) cosim_sample();
+
+`ifndef FAST
             // Memory access debugging
-            if (debug_mem && dut.memory1.write) begin
+            if (debug_mem && trace_on && dut.memory1.write) begin
                 $display("  [Cycle %0d] MEM Write: Addr=0x%02h Data=0x%02h", 
                         cycles, dut.memory1.address, dut.memory1.data_in);
             end
             
             // Show progress every 100 cycles for long tests
-            if (n > 0 && n % 100 == 0 && debug_verbose) begin
+            if (n > 0 && n % 100 == 0 && debug_verbose && trace_on) begin
                 $display("  [Cycle %0d] PC=0x%02h, IR=0x%02h - Still running...", cycles, PC, IR);
             end
+`endif
+        end
+
+        if (coverage_on) begin
+            coverage_on = 0;
+            coverage_write();
+        end
+
+        if (perf_on) begin
+            perf_on = 0;
+            perf_report();
+        end
+
+        if (cosim_active) begin
+            $fwrite(cosim_tx, "E %0d\n", cycles);
+            $fclose(cosim_tx);
+            $fclose(cosim_rx);
+            cosim_active = 0;
+        end
+
+        // Let the last cycle settle, then close the recording with a full snapshot
+        if (record_mcd != 0) begin
+            @(negedge clk); #1;
+            record_active = 0;
+            record_checkpoint();
+            if (record_mcd & ~1) $fclose(record_mcd & ~1);
         end
         
         if (done) begin
@@ -285,9 +749,13 @@ module computer_TB;
         initial begin
             $dumpfile("waves.vcd");
             $dumpvars(clk, reset, cycles);
-            $dumpvars(PC, IR, Reg_A, Reg_B, ROM_output);
+            $dumpvars(PC, IR, Reg_A, Reg_B);
+            $dumpvars(Reg_C, Reg_D, Reg_E, Reg_F, Reg_G, Reg_H, Reg_I, Reg_J);
+            $dumpvars(Reg_K, Reg_L, Reg_M, Reg_N, Reg_O, Reg_P);
             $dumpvars(io_addr, io_data, io_we);
-            $dumpvars(ROM_valid, ROM_sequence_count);
+`ifndef FAST
+            $dumpvars(ROM_output, ROM_valid, ROM_sequence_count);
+`endif
 
             
             // Run the dynamic test
@@ -307,6 +775,9 @@ module computer_TB;
             $display("Max cycles: %0d", debug_cycles);
             $display("Clock period: 20ns (50MHz)");
             $display("Reset: Active high");
+`ifdef FAST
+            $display("Testbench: fast build (debug output compiled out)");
+`else
             
             // Display active debug options
             if (debug_enable || debug_verbose) begin
@@ -321,7 +792,10 @@ module computer_TB;
                 if (debug_verbose) $display("  - Verbose mode");
                 if (debug_start_cycle > 0) $display("  - Debug starts at cycle %0d", debug_start_cycle);
                 if (debug_end_cycle != -1) $display("  - Debug ends at cycle %0d", debug_end_cycle);
+                if (!trace_on) $display("  - Debug waits for a start trigger");
+                if (trig_stop_pc_en || trig_stop_reg_en || trig_stop_wr_en) $display("  - Debug ends on a stop trigger");
             end
+`endif
             $display("");
             
             run_prog(dynamic_rom_file, 0, debug_cycles, dynamic_test_name, "dynamic");
@@ -1,4 +1,6 @@
-module computer(
+module computer #(
+    parameter PREFETCH = 0           // overlapped instruction fetch, see control_unit
+) (
     input clk,
     input reset,
     input debug_inner,
@@ -12,7 +14,7 @@ module computer(
     wire [7:0] data_out;
     wire write;
     
-    cpu cpu1 (
+    cpu #(.PREFETCH(PREFETCH)) cpu1 (
         .clk(clk),
         .reset(reset),
         .debug_inner(debug_inner),
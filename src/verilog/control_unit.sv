@@ -1,10 +1,13 @@
-module control_unit (
+module control_unit #(
+    parameter PREFETCH = 0          // 1 = fetch the next instruction's bytes while this one executes
+) (
     input logic clk,
     input logic reset,
     input logic debug_inner,
     input logic [7:0] IR,
     input logic [7:0] from_memory,
     input logic [3:0] CCR_Result,
+    input logic [7:0] address,
     output logic IR_Load,
     output logic MAR_Load,
     output logic PC_Load,
@@ -34,13 +37,51 @@ module control_unit (
     logic [7:0] reg_operand_1, reg_operand_2;
     logic LoadStoreOP, DataOP, BranchOP;
 
+    // Prefetch buffer (PREFETCH=1): bytes read from ROM[PC] ahead of the FETCH that needs them.
+    // PC always points past the buffered bytes, i.e. up to three bytes ahead of the next opcode.
+    logic [7:0] pf_buf [0:2];
+    logic [1:0] pf_count;
+    logic pf_fill;      // this cycle reads ROM[PC] into the buffer (and increments PC)
+    logic pf_issue;     // this cycle moves a full buffer into IR and the operand registers
+
     // Capture operands at the right time
     always_ff @(posedge clk) begin
-        if (state==FETCH && cycle_count==3) reg_operand_1 <= from_memory; // byte‑1 (register or first operand)
-        if (state==FETCH && cycle_count==5) reg_operand_2 <= from_memory; // byte‑2 (immediate or second operand)
+        if (PREFETCH) begin
+            if (pf_issue) begin
+                reg_operand_1 <= pf_buf[1];
+                reg_operand_2 <= pf_buf[2];
+            end
+        end else begin
+            if (state==FETCH && cycle_count==3) reg_operand_1 <= from_memory; // byte‑1 (register or first operand)
+            if (state==FETCH && cycle_count==5) reg_operand_2 <= from_memory; // byte‑2 (immediate or second operand)
+        end
+    end
+
+    always_ff @(posedge clk or negedge reset) begin
+        if (!reset)
+            pf_count <= 2'd0;
+        else if (PC_Load || pf_issue)                 // taken branch flushes, issue empties
+            pf_count <= 2'd0;
+        else if (pf_fill)
+            pf_count <= pf_count + 2'd1;
     end
 
-    assign immediate_out = (IR[7:4]==4'h2) ? reg_operand_1 : reg_operand_2;
+    always_ff @(posedge clk)
+        if (pf_fill) pf_buf[pf_count] <= from_memory;
+
+    // Address of the instruction last issued into IR (PREFETCH=1), since PC has run past it.
+    // On issue the address bus carries PC and the buffer holds exactly the three bytes before it.
+    logic [7:0] issue_pc;
+    always_ff @(posedge clk or negedge reset) begin
+        if (!reset)
+            issue_pc <= 8'h00;
+        else if (pf_issue)
+            issue_pc <= address - 8'd3;
+    end
+
+    // The opcode byte reaches IR through the immediate bus (Bus2_Sel=3) on issue
+    assign immediate_out = pf_issue ? pf_buf[0] :
+                           (IR[7:4]==4'h2) ? reg_operand_1 : reg_operand_2;
     assign address_out   = reg_operand_2;
 
     // State register with cycle counter
@@ -60,7 +101,7 @@ module control_unit (
         next = state;
 
         unique case (state)
-            FETCH: if (cycle_count==4'd5)
+            FETCH: if (PREFETCH ? pf_count==2'd3 : cycle_count==4'd5)
                         next = DECODE;
 
             DECODE: next = EXECUTE;
@@ -107,7 +148,12 @@ module control_unit (
         CF2    = CF0,
         CF3    = CTL(1'b0,1'b0,1'b0,1'b0,1'b0, 4'd0,4'd0, 2'd0,3'b010, 1'b1,1'b0,1'b0,1'b0),
         CF4    = CF0,
-        CF5    = CF3;
+        CF5    = CF3,
+        CP_FILL  = CF3,                                                                        // buffer <= ROM[PC], PC++
+        CP_ISSUE = CTL(1'b0,1'b0,1'b0,1'b0,1'b0, 4'd0,4'd0, 2'd0,3'b011, 1'b0,1'b0,1'b0,1'b1); // IR <= buffer[0]
+
+    // ctrl_t bit positions (see CTL)
+    localparam int C_ADDR_SEL = 21, C_PC_INC = 3, C_PC_LOAD = 2, C_IR_LOAD = 0;
 
     function automatic ctrl_t INC_and_DEC (input logic inc, input logic [3:0] r);
         return CTL(1'b1, 1'b0,          // addr_sel=1, ALU_B_Sel=0
@@ -185,7 +231,32 @@ module control_unit (
         return c;
     endfunction
 
-    always_comb ctrl = decode(state, cycle_count, IR);
+    ctrl_t base_ctrl;
+    always_comb base_ctrl = decode(state, cycle_count, IR);
+
+    // PREFETCH=1: FETCH only tops the buffer up and issues it. Any other cycle that leaves
+    // the address bus on PC and does not touch PC itself fills one more byte for free.
+    // Branches never prefetch, so PC is exact when BRANCH runs and a taken branch
+    // (PC_Load) starts refilling from the target. INC/DEC loads MAR from PC in LOADSTORE
+    // cycle 0, so it does not fill before then either: MAR must match the baseline build.
+    always_comb begin
+        ctrl     = base_ctrl;
+        pf_fill  = 1'b0;
+        pf_issue = 1'b0;
+        if (PREFETCH) begin
+            if (state == FETCH) begin
+                pf_issue = (pf_count == 2'd3);
+                pf_fill  = !pf_issue;
+                ctrl     = pf_issue ? CP_ISSUE : CP_FILL;
+            end else if (pf_count != 2'd3 && state != BRANCH && IR[7:4] != 4'h2 &&
+                         !(IR[7:4] == 4'hA && state != LOADSTORE) &&
+                         !base_ctrl[C_ADDR_SEL] && !base_ctrl[C_PC_INC] &&
+                         !base_ctrl[C_PC_LOAD] && !base_ctrl[C_IR_LOAD]) begin
+                pf_fill  = 1'b1;
+                ctrl[C_PC_INC] = 1'b1;
+            end
+        end
+    end
 
     // Unpack once
     assign { addr_sel, ALU_B_Sel, write, CCR_Load, reg_write_enable,
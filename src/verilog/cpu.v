@@ -1,4 +1,6 @@
-module cpu(
+module cpu #(
+    parameter PREFETCH = 0
+) (
     input clk,
     input reset,
     input debug_inner,
@@ -34,7 +36,7 @@ module cpu(
     wire [3:0] NZVC;
 
     // Instantiate Control Unit
-    control_unit control_unit1 (
+    control_unit #(.PREFETCH(PREFETCH)) control_unit1 (
         .clk(clk),
         .reset(reset),
         .debug_inner(debug_inner),
@@ -49,6 +51,7 @@ module cpu(
         .reg_write_enable(reg_write_enable),
         .ALU_Sel(ALU_Sel),
         .CCR_Result(CCR_Result),
+        .address(address),
         .CCR_Load(CCR_Load),
         .Bus2_Sel(Bus2_Sel),
         .Bus1_Sel(Bus1_Sel),